@@ -0,0 +1,44 @@
+"""add business_id to inventory
+
+Revision ID: 0a7e4c9b2d18
+Revises: f1d6b3e8c204
+Create Date: 2026-10-15 13:51:36.204815
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7e4c9b2d18'
+down_revision: Union[str, Sequence[str], None] = 'f1d6b3e8c204'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('inventory', sa.Column('business_id', sa.Integer(), nullable=True))
+
+    # Backfill from the owning product
+    op.execute(
+        """
+        UPDATE inventory
+        SET business_id = products.business_id
+        FROM products
+        WHERE products.id = inventory.product_id
+        """
+    )
+
+    op.alter_column('inventory', 'business_id', nullable=False)
+    op.create_index(op.f('ix_inventory_business_id'), 'inventory', ['business_id'], unique=False)
+    op.create_foreign_key('inventory_business_id_fkey', 'inventory', 'businesses', ['business_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('inventory_business_id_fkey', 'inventory', type_='foreignkey')
+    op.drop_index(op.f('ix_inventory_business_id'), table_name='inventory')
+    op.drop_column('inventory', 'business_id')
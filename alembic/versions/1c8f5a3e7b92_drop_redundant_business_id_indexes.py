@@ -0,0 +1,36 @@
+"""drop redundant business_id indexes
+
+Revision ID: 1c8f5a3e7b92
+Revises: 0a7e4c9b2d18
+Create Date: 2026-10-15 14:37:52.661093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c8f5a3e7b92'
+down_revision: Union[str, Sequence[str], None] = '0a7e4c9b2d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ix_sales_business_created and ix_products_business already cover these
+    op.drop_index(op.f('ix_sales_business_id'), table_name='sales')
+    op.drop_index(op.f('ix_products_business_id'), table_name='products')
+
+    # Refresh planner statistics for the tables the report queries join
+    op.execute("ANALYZE sales")
+    op.execute("ANALYZE sale_items")
+    op.execute("ANALYZE products")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_products_business_id'), 'products', ['business_id'], unique=False)
+    op.create_index(op.f('ix_sales_business_id'), 'sales', ['business_id'], unique=False)
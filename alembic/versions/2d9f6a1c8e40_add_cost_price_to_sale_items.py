@@ -0,0 +1,46 @@
+"""add cost_price to sale_items
+
+Revision ID: 2d9f6a1c8e40
+Revises: 1c8f5a3e7b92
+Create Date: 2026-10-15 16:02:41.208517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d9f6a1c8e40'
+down_revision: Union[str, Sequence[str], None] = '1c8f5a3e7b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sale_items', sa.Column('cost_price', sa.Numeric(precision=10, scale=2), nullable=True))
+
+    # Existing rows get the product's current cost price
+    op.execute(
+        """
+        UPDATE sale_items
+        SET cost_price = p.cost_price
+        FROM products p
+        WHERE p.id = sale_items.product_id
+        """
+    )
+
+    op.alter_column('sale_items', 'cost_price', nullable=False)
+
+    # Cost is now read from sale_items itself, so the covering index carries it
+    op.drop_index('ix_sale_items_sale_id_covering', table_name='sale_items')
+    op.create_index('ix_sale_items_sale_id_covering', 'sale_items', ['sale_id'], unique=False, postgresql_include=['product_id', 'quantity', 'line_total', 'cost_price'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sale_items_sale_id_covering', table_name='sale_items')
+    op.create_index('ix_sale_items_sale_id_covering', 'sale_items', ['sale_id'], unique=False, postgresql_include=['product_id', 'quantity', 'line_total'])
+    op.drop_column('sale_items', 'cost_price')
@@ -0,0 +1,50 @@
+"""rebuild daily rollups by utc day
+
+Revision ID: 3e5b8d2f7a61
+Revises: 2d9f6a1c8e40
+Create Date: 2026-10-15 17:12:06.430918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e5b8d2f7a61'
+down_revision: Union[str, Sequence[str], None] = '2d9f6a1c8e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows were bucketed by the session's current_date; readers use the
+    # UTC day. Rebuild from sales, with the cost snapshot on sale_items
+    op.execute("DELETE FROM daily_business_rollups")
+    op.execute(
+        """
+        INSERT INTO daily_business_rollups
+            (business_id, day, revenue_kobo, cost_kobo, sales_count)
+        SELECT
+            s.business_id,
+            (s.created_at AT TIME ZONE 'UTC')::date,
+            ROUND(SUM(s.total_amount) * 100)::bigint,
+            ROUND(COALESCE(SUM(c.cost), 0) * 100)::bigint,
+            COUNT(*)
+        FROM sales s
+        LEFT JOIN (
+            SELECT si.sale_id, SUM(si.cost_price * si.quantity) AS cost
+            FROM sale_items si
+            GROUP BY si.sale_id
+        ) c ON c.sale_id = s.id
+        GROUP BY s.business_id, (s.created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Data-only migration; the UTC buckets are kept
+    pass
@@ -0,0 +1,28 @@
+"""add data_version to businesses
+
+Revision ID: 4a9d2c7e1f53
+Revises: 3e5b8d2f7a61
+Create Date: 2026-10-15 18:04:27.915302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9d2c7e1f53'
+down_revision: Union[str, Sequence[str], None] = '3e5b8d2f7a61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('businesses', sa.Column('data_version', sa.BigInteger(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('businesses', 'data_version')
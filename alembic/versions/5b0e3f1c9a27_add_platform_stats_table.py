@@ -0,0 +1,40 @@
+"""add platform stats table
+
+Revision ID: 5b0e3f1c9a27
+Revises: 8441c757bce0
+Create Date: 2026-10-15 10:03:17.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0e3f1c9a27'
+down_revision: Union[str, Sequence[str], None] = '8441c757bce0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('platform_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_businesses', sa.Integer(), nullable=False),
+    sa.Column('suspended_businesses', sa.Integer(), nullable=False),
+    sa.Column('total_revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('revenue_last_30_days', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_subscription_revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('active_premium_subscriptions', sa.Integer(), nullable=False),
+    sa.Column('active_weekly_businesses', sa.Integer(), nullable=False),
+    sa.Column('active_monthly_businesses', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('platform_stats')
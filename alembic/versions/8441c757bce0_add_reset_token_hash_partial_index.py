@@ -0,0 +1,35 @@
+"""add reset token hash partial index
+
+Revision ID: 8441c757bce0
+Revises: 8276a00f3321
+Create Date: 2026-10-15 09:12:40.318215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8441c757bce0'
+down_revision: Union[str, Sequence[str], None] = '8276a00f3321'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Only rows with an outstanding reset token are indexed
+    op.create_index(
+        'ix_users_reset_token_hash',
+        'users',
+        ['reset_token_hash'],
+        unique=False,
+        postgresql_where=sa.text('reset_token_hash IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_reset_token_hash', table_name='users')
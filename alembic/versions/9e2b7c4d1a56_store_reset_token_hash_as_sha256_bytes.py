@@ -0,0 +1,66 @@
+"""store reset token hash as sha256 bytes
+
+Revision ID: 9e2b7c4d1a56
+Revises: c3a91d7e4f08
+Create Date: 2026-10-15 11:27:03.584210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b7c4d1a56'
+down_revision: Union[str, Sequence[str], None] = 'c3a91d7e4f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_users_reset_token_hash', table_name='users')
+
+    # Outstanding argon2 reset hashes cannot be converted; those users
+    # simply request a new link
+    op.execute('UPDATE users SET reset_token_hash = NULL, reset_token_expires_at = NULL')
+    op.alter_column(
+        'users',
+        'reset_token_hash',
+        existing_type=sa.String(),
+        type_=sa.LargeBinary(),
+        existing_nullable=True,
+        postgresql_using='NULL::bytea',
+    )
+
+    op.create_index(
+        'ix_users_reset_token_hash',
+        'users',
+        ['reset_token_hash'],
+        unique=False,
+        postgresql_where=sa.text('reset_token_hash IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_reset_token_hash', table_name='users')
+
+    op.execute('UPDATE users SET reset_token_hash = NULL, reset_token_expires_at = NULL')
+    op.alter_column(
+        'users',
+        'reset_token_hash',
+        existing_type=sa.LargeBinary(),
+        type_=sa.String(),
+        existing_nullable=True,
+        postgresql_using='NULL::varchar',
+    )
+
+    op.create_index(
+        'ix_users_reset_token_hash',
+        'users',
+        ['reset_token_hash'],
+        unique=False,
+        postgresql_where=sa.text('reset_token_hash IS NOT NULL'),
+    )
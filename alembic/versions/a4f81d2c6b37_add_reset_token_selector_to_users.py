@@ -0,0 +1,52 @@
+"""add reset token selector to users
+
+Revision ID: a4f81d2c6b37
+Revises: 9e2b7c4d1a56
+Create Date: 2026-10-15 11:58:42.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f81d2c6b37'
+down_revision: Union[str, Sequence[str], None] = '9e2b7c4d1a56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('reset_token_selector', sa.String(), nullable=True))
+
+    # Tokens issued before the selector existed can no longer be redeemed
+    op.execute('UPDATE users SET reset_token_hash = NULL, reset_token_expires_at = NULL')
+
+    # Lookups now go through the selector; the hash is only compared
+    op.drop_index('ix_users_reset_token_hash', table_name='users')
+    op.create_index(
+        'ix_users_reset_token_selector',
+        'users',
+        ['reset_token_selector'],
+        unique=True,
+        postgresql_where=sa.text('reset_token_selector IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_reset_token_selector', table_name='users')
+
+    op.execute('UPDATE users SET reset_token_hash = NULL, reset_token_expires_at = NULL')
+    op.create_index(
+        'ix_users_reset_token_hash',
+        'users',
+        ['reset_token_hash'],
+        unique=False,
+        postgresql_where=sa.text('reset_token_hash IS NOT NULL'),
+    )
+
+    op.drop_column('users', 'reset_token_selector')
@@ -0,0 +1,28 @@
+"""add users business_id index
+
+Revision ID: b7d3e9a15c20
+Revises: a4f81d2c6b37
+Create Date: 2026-10-15 12:36:18.442907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a15c20'
+down_revision: Union[str, Sequence[str], None] = 'a4f81d2c6b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_users_business_id'), 'users', ['business_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_business_id'), table_name='users')
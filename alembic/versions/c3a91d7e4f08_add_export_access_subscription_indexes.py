@@ -0,0 +1,30 @@
+"""add export access subscription indexes
+
+Revision ID: c3a91d7e4f08
+Revises: 5b0e3f1c9a27
+Create Date: 2026-10-15 10:41:55.120387
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a91d7e4f08'
+down_revision: Union[str, Sequence[str], None] = '5b0e3f1c9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_export_access_biz_period_end', 'export_access', ['business_id', 'period_type', 'end_date'], unique=False)
+    op.create_index('ix_export_access_biz_end', 'export_access', ['business_id', 'end_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_export_access_biz_end', table_name='export_access')
+    op.drop_index('ix_export_access_biz_period_end', table_name='export_access')
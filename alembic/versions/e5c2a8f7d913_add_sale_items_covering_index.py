@@ -0,0 +1,30 @@
+"""add sale_items covering index
+
+Revision ID: e5c2a8f7d913
+Revises: b7d3e9a15c20
+Create Date: 2026-10-15 13:02:41.377215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5c2a8f7d913'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e9a15c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_sale_items_sale_id_covering', 'sale_items', ['sale_id'], unique=False, postgresql_include=['product_id', 'quantity', 'line_total'])
+    op.drop_index(op.f('ix_sale_items_sale_id'), table_name='sale_items')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_sale_items_sale_id'), 'sale_items', ['sale_id'], unique=False)
+    op.drop_index('ix_sale_items_sale_id_covering', table_name='sale_items')
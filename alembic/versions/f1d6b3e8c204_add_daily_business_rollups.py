@@ -0,0 +1,58 @@
+"""add daily business rollups
+
+Revision ID: f1d6b3e8c204
+Revises: e5c2a8f7d913
+Create Date: 2026-10-15 13:24:09.518362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1d6b3e8c204'
+down_revision: Union[str, Sequence[str], None] = 'e5c2a8f7d913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_business_rollups',
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('revenue_kobo', sa.BigInteger(), nullable=False),
+    sa.Column('cost_kobo', sa.BigInteger(), nullable=False),
+    sa.Column('sales_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ),
+    sa.PrimaryKeyConstraint('business_id', 'day')
+    )
+
+    # Backfill from existing sales, bucketed by UTC day like record_sale
+    op.execute(
+        """
+        INSERT INTO daily_business_rollups
+            (business_id, day, revenue_kobo, cost_kobo, sales_count)
+        SELECT
+            s.business_id,
+            (s.created_at AT TIME ZONE 'UTC')::date,
+            ROUND(SUM(s.total_amount) * 100)::bigint,
+            ROUND(COALESCE(SUM(c.cost), 0) * 100)::bigint,
+            COUNT(*)
+        FROM sales s
+        LEFT JOIN (
+            SELECT si.sale_id, SUM(p.cost_price * si.quantity) AS cost
+            FROM sale_items si
+            JOIN products p ON p.id = si.product_id
+            GROUP BY si.sale_id
+        ) c ON c.sale_id = s.id
+        GROUP BY s.business_id, (s.created_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_business_rollups')
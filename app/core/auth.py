@@ -1,7 +1,12 @@
 # app/core/auth.py
 
+import threading
+from typing import NamedTuple
+
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
 from app.models.users import User
@@ -9,10 +14,69 @@ from app.core.jwt import decode_access_token
 from app.core.oauth2 import oauth2_scheme
 
 
-def get_current_user(
+class CurrentUser(NamedTuple):
+    """Detached snapshot of the fields routes read from the current user."""
+    id: int
+    email: str
+    business_id: int
+    is_admin: bool
+
+
+# user_id -> CurrentUser for users that already passed the suspension check
+_user_cache = TTLCache(maxsize=50_000, ttl=30)
+_user_cache_lock = threading.Lock()
+
+
+def invalidate_cached_user(user_id: int):
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def invalidate_cached_business(business_id: int):
+    with _user_cache_lock:
+        stale = [
+            user_id
+            for user_id, user in _user_cache.items()
+            if user.business_id == business_id
+        ]
+        for user_id in stale:
+            _user_cache.pop(user_id, None)
+
+
+def _load_current_user(db: Session, user_id: int) -> CurrentUser:
+    # Business is read for the suspension check; load it in the same query
+    user = db.get(User, user_id, options=[joinedload(User.business)])
+
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+
+    #  FIXED: Allow admins to bypass suspension
+    if (
+        user.business
+        and user.business.is_suspended
+        and not user.is_admin
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Business account suspended. Contact support.",
+        )
+
+    return CurrentUser(
+        id=user.id,
+        email=user.email,
+        business_id=user.business_id,
+        is_admin=user.is_admin,
+    )
+
+
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
 ):
+    # Async so cache hits resolve on the event loop without a threadpool slot
     payload = decode_access_token(token)
 
     if payload is None:
@@ -37,34 +101,27 @@ def get_current_user(
             detail="Invalid token payload",
         )
 
-    user = db.query(User).filter(User.id == user_id).one_or_none()
+    with _user_cache_lock:
+        cached_user = _user_cache.get(user_id)
 
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
+    if cached_user is not None:
+        return cached_user
 
-    #  FIXED: Allow admins to bypass suspension
-    if (
-        user.business
-        and user.business.is_suspended
-        and not user.is_admin
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Business account suspended. Contact support.",
-        )
+    # Blocking DB access only happens on a cache miss
+    current_user = await run_in_threadpool(_load_current_user, db, user_id)
+
+    with _user_cache_lock:
+        _user_cache[user_id] = current_user
 
-    return user
+    return current_user
 
 
-def get_admin_user(
-    current_user: User = Depends(get_current_user),
+async def get_admin_user(
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required",
         )
-    return current_user
\ No newline at end of file
+    return current_user
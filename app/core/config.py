@@ -16,6 +16,13 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
 
+    # Queries slower than this are logged with a warning
+    SLOW_QUERY_THRESHOLD_MS: int = 100
+
+    # Outside production, relationship lazy loads (the N+1 pattern) are
+    # logged; set this in tests/CI to make them raise instead
+    LAZY_LOAD_RAISE: bool = False
+
     # Paystack
     PAYSTACK_SECRET_KEY: str | None = None
 
@@ -38,6 +45,11 @@ class Settings(BaseSettings):
     # Frontend
     FRONTEND_RESET_URL: str
 
+    # Background exports (files are reused for EXPORT_CACHE_TTL_MINUTES)
+    EXPORT_DIR: str | None = None
+    EXPORT_CACHE_TTL_MINUTES: int = 10
+    EXPORT_URL_EXPIRE_MINUTES: int = 15
+
 
 
     model_config = SettingsConfigDict(
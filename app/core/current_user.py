@@ -1,6 +1,6 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.database import get_db
 from app.models.users import User
@@ -24,7 +24,18 @@ def get_current_user(
 
     user_id = payload.get("sub")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+        )
+
+    # Routes here need the live ORM user (it is modified), so this can't
+    # share the CurrentUser cache in app/core/auth.py; get() at least
+    # skips the query when the user is already in the session
+    user = db.get(User, user_id, options=[joinedload(User.business)])
 
     if not user:
         raise HTTPException(
@@ -1,11 +1,20 @@
-import requests
+import httpx
 
 from app.core.config import settings
 
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+
+# Shared client so the TLS connection to Resend is kept alive between sends
+_client = httpx.AsyncClient(
+    timeout=10.0,
+    headers={
+        "Authorization": f"Bearer {settings.RESEND_API_KEY}",
+        "Content-Type": "application/json",
+    },
+)
 
-def send_password_reset_email(to_email: str, reset_link: str):
-    url = "https://api.resend.com/emails"
 
+async def send_password_reset_email(to_email: str, reset_link: str):
     payload = {
         "from": settings.RESEND_FROM_EMAIL,
         "to": [to_email],
@@ -26,12 +35,11 @@ If you did not request this, you can safely ignore this email.
 """,
     }
 
-    headers = {
-        "Authorization": f"Bearer {settings.RESEND_API_KEY}",
-        "Content-Type": "application/json",
-    }
-
-    response = requests.post(url, json=payload, headers=headers)
+    response = await _client.post(RESEND_EMAILS_URL, json=payload)
 
     if response.status_code >= 400:
-        raise Exception(f"Email sending failed: {response.text}")
\ No newline at end of file
+        raise Exception(f"Email sending failed: {response.text}")
+
+
+async def close_email_client():
+    await _client.aclose()
@@ -1,34 +1,66 @@
+import threading
+import time
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
+from cachetools import TTLCache
+import jwt
+from jwt import InvalidTokenError
 from app.core.config import settings
 
+# Bound once at import; settings are immutable for the process lifetime
+_SECRET = settings.SECRET_KEY.encode()
+_ALG = settings.ALGORITHM
+_ALGS = [settings.ALGORITHM]
+_DEFAULT_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# Decoded payloads of tokens that already passed verification.
+# Entries never outlive the token itself (exp is re-checked on every hit).
+_token_cache = TTLCache(
+    maxsize=10_000,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+_token_cache_lock = threading.Lock()
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
 
-    expire = datetime.utcnow() + (
-        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    expire = datetime.utcnow() + (expires_delta or _DEFAULT_EXPIRE)
     to_encode.update({"exp": expire, "type": "access"})
 
     return jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        _SECRET,
+        algorithm=_ALG
     )
 
 def decode_access_token(token: str):
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+
+        with _token_cache_lock:
+            _token_cache.pop(token, None)
+        return None
+
     try:
         payload = jwt.decode(
             token,
-            settings.SECRET_KEY,
-            algorithms=[settings.ALGORITHM]
+            _SECRET,
+            algorithms=_ALGS
         )
-        
+
         # Ensure the token type is "access"
         if payload.get("type") != "access":
             return None
-        
+
+        # Only successfully verified tokens are cached
+        if isinstance(payload.get("exp"), (int, float)):
+            with _token_cache_lock:
+                _token_cache[token] = payload
+
         return payload
-    
-    except JWTError:
+
+    except InvalidTokenError:
         return None
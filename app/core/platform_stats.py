@@ -0,0 +1,129 @@
+# =========================================================
+# SALESZY PLATFORM STATS
+# Precomputes the admin overview into the platform_stats row
+# =========================================================
+
+from datetime import datetime, timedelta
+from sqlalchemy import and_, distinct, func, literal, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models.business import Business
+from app.models.sales import Sale
+from app.models.export_access import ExportAccess
+from app.models.platform_stats import PlatformStats
+
+PLATFORM_STATS_ID = 1
+
+
+def refresh_platform_stats(db: Session) -> PlatformStats:
+    """Recompute the overview aggregates and upsert the stats row"""
+    today = datetime.utcnow().date()
+    start_30 = today - timedelta(days=29)
+
+    # One aggregate subquery per table, every metric via FILTER
+    business_stats = select(
+        func.count(Business.id).label("total_businesses"),
+        func.count(Business.id)
+        .filter(Business.is_suspended == True)
+        .label("suspended_businesses"),
+    ).subquery("business_stats")
+
+    sale_stats = select(
+        func.coalesce(func.sum(Sale.total_amount), 0).label("total_revenue"),
+        func.coalesce(
+            func.sum(Sale.total_amount).filter(Sale.created_at >= start_30), 0
+        ).label("revenue_last_30_days"),
+    ).subquery("sale_stats")
+
+    is_active = and_(
+        ExportAccess.start_date <= today,
+        ExportAccess.end_date >= today,
+    )
+
+    subscription_stats = select(
+        func.coalesce(func.sum(ExportAccess.amount_paid), 0)
+        .label("total_subscription_revenue"),
+        func.count(distinct(ExportAccess.business_id))
+        .filter(is_active)
+        .label("active_premium_subscriptions"),
+        func.count(distinct(ExportAccess.business_id))
+        .filter(is_active, ExportAccess.period_type == "weekly")
+        .label("active_weekly_businesses"),
+        func.count(distinct(ExportAccess.business_id))
+        .filter(is_active, ExportAccess.period_type == "monthly")
+        .label("active_monthly_businesses"),
+    ).subquery("subscription_stats")
+
+    stats = select(
+        literal(PLATFORM_STATS_ID).label("id"),
+        business_stats.c.total_businesses,
+        business_stats.c.suspended_businesses,
+        sale_stats.c.total_revenue,
+        sale_stats.c.revenue_last_30_days,
+        subscription_stats.c.total_subscription_revenue,
+        subscription_stats.c.active_premium_subscriptions,
+        subscription_stats.c.active_weekly_businesses,
+        subscription_stats.c.active_monthly_businesses,
+        func.now().label("updated_at"),
+    ).select_from(
+        # Each subquery is a single row
+        business_stats
+        .join(sale_stats, true())
+        .join(subscription_stats, true())
+    )
+
+    columns = [column.name for column in stats.selected_columns]
+
+    # Computed and written in one statement; the upsert means concurrent
+    # refreshes (one per worker) never collide
+    statement = insert(PlatformStats).from_select(columns, stats)
+    statement = statement.on_conflict_do_update(
+        index_elements=[PlatformStats.id],
+        set_={
+            name: statement.excluded[name]
+            for name in columns
+            if name != "id"
+        },
+    )
+
+    db.execute(statement)
+    db.commit()
+
+    return db.get(PlatformStats, PLATFORM_STATS_ID, populate_existing=True)
+
+
+def adjust_suspended_businesses(db: Session, delta: int):
+    """
+    Apply a suspension change to the stats row in the caller's
+    transaction, instead of re-running every aggregate
+    """
+    db.execute(
+        update(PlatformStats)
+        .where(PlatformStats.id == PLATFORM_STATS_ID)
+        .values(
+            suspended_businesses=PlatformStats.suspended_businesses + delta,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def get_platform_stats(db: Session) -> PlatformStats:
+    stats = db.get(PlatformStats, PLATFORM_STATS_ID)
+
+    # First request before the scheduler has run
+    if stats is None:
+        stats = refresh_platform_stats(db)
+
+    return stats
+
+
+def run_platform_stats_refresh():
+    db: Session = SessionLocal()
+
+    try:
+        refresh_platform_stats(db)
+    finally:
+        db.close()
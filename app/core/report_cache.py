@@ -0,0 +1,143 @@
+# =========================================================
+# SALESZY REPORT CACHE
+# Computed report / insight results, per business
+# =========================================================
+
+import hashlib
+import threading
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.core.auth import get_current_user
+from app.models.business import Business
+from app.utils.dates import LAGOS_TZ
+
+# (business_id, name, *params, version) -> computed result.
+# Keys carry the report dates, so entries roll over with the calendar,
+# and the business's stored data_version, so a write (sales, stock,
+# product prices, payments) retires every entry at once in every worker;
+# old entries just age out.
+_report_cache = TTLCache(maxsize=20_000, ttl=600)
+_report_cache_lock = threading.Lock()
+
+# data_version of the current request's business, loaded once by
+# report_etag. Context variables follow the request into the threadpool
+_request_version: ContextVar[int | None] = ContextVar(
+    "report_data_version", default=None
+)
+
+
+def bump_data_version(db: Session, business_id: int):
+    """
+    Mark a business's data as changed. Call inside the writing
+    transaction, before commit, so the version moves with the data
+    for every worker and survives restarts.
+    """
+    db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(data_version=Business.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def load_data_version(db: Session, business_id: int) -> int:
+    return db.scalar(
+        select(Business.data_version).where(Business.id == business_id)
+    ) or 0
+
+
+def _versioned(key: tuple):
+    version = _request_version.get()
+
+    # Without a known version a hit could be stale: don't cache
+    if version is None:
+        return None
+
+    return (*key, version)
+
+
+def cached_report(key: tuple, compute):
+    key = _versioned(key)
+
+    if key is None:
+        return compute()
+
+    with _report_cache_lock:
+        result = _report_cache.get(key)
+
+    if result is None:
+        # Queries only run on a miss
+        result = compute()
+
+        with _report_cache_lock:
+            _report_cache[key] = result
+
+    # Callers adjust fields (e.g. hiding profit for free plans);
+    # hand out a copy so the cached entry stays intact
+    if isinstance(result, dict):
+        return dict(result)
+
+    return result
+
+
+async def cached_report_async(key: tuple, compute):
+    """
+    cached_report for async endpoints: a hit is served on the event loop,
+    a miss runs the (blocking) queries in the threadpool.
+    """
+    versioned = _versioned(key)
+    result = None
+
+    if versioned is not None:
+        with _report_cache_lock:
+            result = _report_cache.get(versioned)
+
+    if result is None:
+        return await run_in_threadpool(cached_report, key, compute)
+
+    if isinstance(result, dict):
+        return dict(result)
+
+    return result
+
+
+async def report_etag(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Conditional GET for report endpoints. The tag covers the business's
+    stored data version, the URL (path + query) and the current UTC and
+    Nigerian dates, so an unchanged report is answered with 304 before
+    any report query runs. The version is shared by all workers, so any
+    of them can answer a tag another one issued.
+    """
+    version = await run_in_threadpool(
+        load_data_version, db, current_user.business_id
+    )
+    _request_version.set(version)
+
+    now = datetime.now(timezone.utc)
+    etag = '"%s"' % hashlib.blake2b(
+        f"{current_user.business_id}:{version}:"
+        f"{request.url.path}?{request.url.query}:"
+        f"{now.date()}:{now.astimezone(LAGOS_TZ).date()}".encode(),
+        digest_size=16,
+    ).hexdigest()
+
+    if request.headers.get("if-none-match") == etag:
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    # Clients may keep the body but must revalidate before reusing it
+    response.headers["Cache-Control"] = "private, no-cache"
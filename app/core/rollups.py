@@ -0,0 +1,40 @@
+# =========================================================
+# SALESZY DAILY ROLLUPS
+# Running per-day totals behind report summaries
+# =========================================================
+
+from decimal import Decimal
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.daily_business_rollup import DailyBusinessRollup
+from app.utils.money import to_kobo
+
+
+def record_sale(db: Session, business_id: int, total_amount: Decimal, total_cost: Decimal):
+    """
+    Add a sale to its day's rollup row. Runs in the caller's transaction
+    so the rollup commits (or rolls back) together with the sale.
+    """
+    statement = insert(DailyBusinessRollup).values(
+        business_id=business_id,
+        # UTC day of now(), which is sale.created_at in this transaction.
+        # current_date would follow the session's TimeZone instead
+        day=func.date(func.timezone("UTC", func.now())),
+        revenue_kobo=to_kobo(total_amount),
+        cost_kobo=to_kobo(total_cost),
+        sales_count=1,
+    )
+
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[DailyBusinessRollup.business_id, DailyBusinessRollup.day],
+            set_={
+                "revenue_kobo": DailyBusinessRollup.revenue_kobo + statement.excluded.revenue_kobo,
+                "cost_kobo": DailyBusinessRollup.cost_kobo + statement.excluded.cost_kobo,
+                "sales_count": DailyBusinessRollup.sales_count + statement.excluded.sales_count,
+            },
+        )
+    )
@@ -3,24 +3,100 @@
 # Centralized logic for checking active subscription
 # =========================================================
 
-from datetime import datetime, timezone
+import threading
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import NamedTuple
+
+from cachetools import TTLCache
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from app.database import get_db
+from app.core.auth import get_current_user
 from app.models.export_access import ExportAccess
 
 
+class ActiveSubscription(NamedTuple):
+    """Detached snapshot of an ExportAccess row (safe to cache across sessions)"""
+    period_type: str
+    start_date: date
+    end_date: date
+    amount_paid: Decimal
+
+
+# period_type -> (price in kobo, extra days after start_date).
+# Shared by payment initialization and the Paystack webhook
+PERIOD_PLANS = {
+    "weekly": (50000, 6),
+    "monthly": (150000, 29),
+}
+
+
+# (business_id, period_type, today) -> ActiveSubscription (active plans only)
+_subscription_cache = TTLCache(maxsize=10_000, ttl=60)
+_subscription_cache_lock = threading.Lock()
+_MISSING = object()
+
+
+def free_tier_cutoff() -> datetime:
+    """
+    Oldest sale a free plan may see. Aware UTC, so it binds as a
+    timestamptz and compares directly against sales.created_at.
+    """
+    return datetime.now(timezone.utc) - timedelta(days=6)
+
+
+def invalidate_subscription_cache(business_id: int):
+    """Drop cached checks for a business (call after a payment is recorded)"""
+    with _subscription_cache_lock:
+        stale = [key for key in _subscription_cache if key[0] == business_id]
+        for key in stale:
+            _subscription_cache.pop(key, None)
+
+
+def _cached_lookup(key: tuple, load):
+    with _subscription_cache_lock:
+        cached = _subscription_cache.get(key, _MISSING)
+
+    if cached is not _MISSING:
+        return cached
+
+    # Query is only built and run on a miss
+    access = load()
+
+    # "No subscription" is not cached: a payment recorded by another
+    # worker must unlock access on the very next request
+    if access is None:
+        return None
+
+    result = ActiveSubscription(
+        period_type=access.period_type,
+        start_date=access.start_date,
+        end_date=access.end_date,
+        amount_paid=access.amount_paid,
+    )
+
+    with _subscription_cache_lock:
+        _subscription_cache[key] = result
+
+    return result
+
+
 def get_active_subscription(db: Session, business_id: int):
     """Get any active subscription (weekly OR monthly)"""
-    today = datetime.now(timezone.utc).date()
+    today = datetime.utcnow().date()
 
-    return (
-        db.query(ExportAccess)
+    return _cached_lookup(
+        (business_id, None, today),
+        lambda: db.query(ExportAccess)
         .filter(
             ExportAccess.business_id == business_id,
             ExportAccess.start_date <= today,
             ExportAccess.end_date >= today,
         )
         .order_by(ExportAccess.end_date.desc())
-        .first()
+        .first(),
     )
 
 
@@ -30,12 +106,13 @@ def require_subscription(db: Session, business_id: int, period_type: str):
     - Weekly plan: can access weekly features
     - Monthly plan: can access BOTH weekly AND monthly features
     """
-    today = datetime.now(timezone.utc).date()
+    today = datetime.utcnow().date()
 
     # If requesting weekly, check for either weekly OR monthly subscription
     if period_type == "weekly":
-        return (
-            db.query(ExportAccess)
+        return _cached_lookup(
+            (business_id, "weekly", today),
+            lambda: db.query(ExportAccess)
             .filter(
                 ExportAccess.business_id == business_id,
                 ExportAccess.start_date <= today,
@@ -43,13 +120,14 @@ def require_subscription(db: Session, business_id: int, period_type: str):
                 ExportAccess.period_type.in_(["weekly", "monthly"])  # ← KEY CHANGE
             )
             .order_by(ExportAccess.end_date.desc())
-            .first()
+            .first(),
         )
-    
+
     # If requesting monthly, only monthly subscription works
     else:  # monthly
-        return (
-            db.query(ExportAccess)
+        return _cached_lookup(
+            (business_id, "monthly", today),
+            lambda: db.query(ExportAccess)
             .filter(
                 ExportAccess.business_id == business_id,
                 ExportAccess.period_type == "monthly",
@@ -57,5 +135,44 @@ def require_subscription(db: Session, business_id: int, period_type: str):
                 ExportAccess.end_date >= today,
             )
             .order_by(ExportAccess.end_date.desc())
-            .first()
-        )
\ No newline at end of file
+            .first(),
+        )
+
+
+# ---------------------------------------------------------
+# Async variants: answer cache hits on the event loop and only
+# take a threadpool slot for the blocking query on a miss
+# ---------------------------------------------------------
+def _peek(key: tuple):
+    with _subscription_cache_lock:
+        return _subscription_cache.get(key, _MISSING)
+
+
+async def get_active_subscription_async(db: Session, business_id: int):
+    cached = _peek((business_id, None, datetime.utcnow().date()))
+
+    if cached is not _MISSING:
+        return cached
+
+    return await run_in_threadpool(get_active_subscription, db, business_id)
+
+
+async def require_subscription_async(db: Session, business_id: int, period_type: str):
+    plan_key = "weekly" if period_type == "weekly" else "monthly"
+    cached = _peek((business_id, plan_key, datetime.utcnow().date()))
+
+    if cached is not _MISSING:
+        return cached
+
+    return await run_in_threadpool(require_subscription, db, business_id, period_type)
+
+
+async def current_subscription(
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    """
+    Dependency form of get_active_subscription for the current user.
+    FastAPI resolves it once per request however many dependants use it.
+    """
+    return await get_active_subscription_async(db, current_user.business_id)
@@ -1,7 +1,9 @@
 # app/database.py
 
+import logging
+import time
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 from app.core.config import settings
@@ -12,16 +14,58 @@ DATABASE_URL = settings.DATABASE_URL
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL environment variable not set")
 
+logger = logging.getLogger("app")
+
 engine = create_engine(
     settings.DATABASE_URL, 
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=10,
+    max_overflow=20,
     pool_timeout=30,
+    pool_recycle=1800,
+    # Compiled SQL cache per engine (default 500); room for every
+    # statement shape the routers build, so none are recompiled
+    query_cache_size=1200,
 )
 
+
+# SLOW QUERY LOGGING
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+
+    if elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning("Slow query (%.1fms): %s", elapsed_ms, statement)
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# LAZY LOAD DETECTION (development / CI only)
+
+if settings.ENV != "production":
+
+    @event.listens_for(SessionLocal, "do_orm_execute")
+    def _report_lazy_load(orm_execute_state):
+        # Only set for lazy loads; selectin/joined eager loads leave it None
+        instance_state = orm_execute_state.lazy_loaded_from
+
+        if instance_state is None:
+            return
+
+        message = f"Lazy load from {instance_state.class_.__name__} (possible N+1)"
+
+        if settings.LAZY_LOAD_RAISE:
+            raise RuntimeError(message)
+
+        logger.warning(message)
+
 Base = declarative_base()
 
 def get_db():
@@ -5,7 +5,7 @@ import time
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
@@ -13,6 +13,8 @@ from app.notifications.scheduler import start_scheduler
 from app.database import engine, Base
 from app.core.rate_limiter import limiter
 from app.core.config import settings
+from app.core.email import close_email_client
+from app.routers.payments import close_paystack_client
 from app.routers import (
     auth,
     products,
@@ -48,6 +50,10 @@ app = FastAPI(
     title="Simple Sales & Inventory API",
     description="Backend system for small vendors to track sales and inventory",
     version="1.0.0",
+    # orjson renders the (Decimal-heavy) report payloads several times
+    # faster than stdlib json; Decimals are already turned into JSON
+    # types by the response model / jsonable_encoder before rendering
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -92,17 +98,20 @@ app.add_exception_handler(
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
 
     response = await call_next(request)
 
-    duration = round((time.time() - start_time) * 1000, 2)
-
-    logger.info(
-        f"{request.method} {request.url.path} "
-        f"Status: {response.status_code} "
-        f"Time: {duration}ms"
-    )
+    # %-style args: the message is only formatted if INFO is enabled
+    if logger.isEnabledFor(logging.INFO):
+        duration_ms = (time.perf_counter_ns() - start_time) / 1_000_000
+        logger.info(
+            "%s %s Status: %s Time: %.2fms",
+            request.method,
+            request.url.path,
+            response.status_code,
+            duration_ms,
+        )
 
     return response
 
@@ -128,10 +137,13 @@ app.include_router(dashboard.router)
 
 # ROOT
 
+ROOT_RESPONSE = {"message": "Saleszy API is running"}
+
+
 @app.get("/")
-def root():
-    logger.info("Health check endpoint called")
-    return {"message": "Saleszy API is running"}
+async def root():
+    logger.debug("Health check endpoint called")
+    return ROOT_RESPONSE
 
 @app.on_event("startup")
 def check_db_connection():
@@ -147,6 +159,11 @@ def check_db_connection():
         raise e    
 
 
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_email_client()
+    await close_paystack_client()
+
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -6,3 +6,5 @@ from .sale_items import SaleItem
 from .business import Business
 from .export_access import ExportAccess
 from .product_units import ProductUnitConversion
+from .platform_stats import PlatformStats
+from .daily_business_rollup import DailyBusinessRollup
@@ -1,6 +1,6 @@
 # app/models/business.py
 
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, Date
+from sqlalchemy import BigInteger, Boolean, Column, Integer, String, DateTime, Date
 from sqlalchemy.sql import func
 from datetime import date
 
@@ -19,4 +19,8 @@ class Business(Base):
     last_sale_date = Column(Date, nullable=True)
     current_streak = Column(Integer, default=0, nullable=False)
     
+    # Bumped in the same transaction as every write that changes report
+    # or export output; cached results are keyed on it
+    data_version = Column(BigInteger, nullable=False, default=0, server_default="0")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
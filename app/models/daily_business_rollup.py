@@ -0,0 +1,23 @@
+# app/models/daily_business_rollup.py
+
+from sqlalchemy import BigInteger, Column, Date, ForeignKey, Integer
+
+from app.database import Base
+
+
+class DailyBusinessRollup(Base):
+    """
+    Per-business, per-day sales totals in kobo.
+
+    Upserted inside the sale-creation transaction so report summaries
+    sum at most a month of rows instead of every sale in the period.
+    Cost is frozen at the product's cost price when the sale was made.
+    """
+    __tablename__ = "daily_business_rollups"
+
+    business_id = Column(Integer, ForeignKey("businesses.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    revenue_kobo = Column(BigInteger, nullable=False, default=0)
+    cost_kobo = Column(BigInteger, nullable=False, default=0)
+    sales_count = Column(Integer, nullable=False, default=0)
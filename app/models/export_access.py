@@ -5,6 +5,7 @@ from sqlalchemy import (
     DateTime,
     String,
     ForeignKey,
+    Index,
     Numeric,
     UniqueConstraint,
     CheckConstraint,
@@ -34,6 +35,19 @@ class ExportAccess(Base):
             "amount_paid > 0",
             name="ck_amount_paid_positive",
         ),
+        # require_subscription: business + period, newest end_date first
+        Index(
+            "ix_export_access_biz_period_end",
+            "business_id",
+            "period_type",
+            "end_date",
+        ),
+        # get_active_subscription: business, newest end_date first
+        Index(
+            "ix_export_access_biz_end",
+            "business_id",
+            "end_date",
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
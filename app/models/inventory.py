@@ -19,6 +19,15 @@ class Inventory(Base):
         index=True,
     )
 
+    # Copied from the product at insert time so per-business inventory
+    # reads filter this table directly instead of joining products
+    business_id = Column(
+        Integer,
+        ForeignKey("businesses.id"),
+        nullable=False,
+        index=True,
+    )
+
     # CHANGED: Integer → Numeric
     # Inventory must support decimal quantities because
     # unit conversion may result in fractional base units.
@@ -0,0 +1,35 @@
+# app/models/platform_stats.py
+
+from sqlalchemy import Column, Integer, Numeric, DateTime
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class PlatformStats(Base):
+    """
+    Precomputed admin overview (single row, id = 1).
+
+    Refreshed by the scheduler (suspensions adjust their counter
+    in place) so /admin/overview never aggregates the whole sales table.
+    """
+    __tablename__ = "platform_stats"
+
+    id = Column(Integer, primary_key=True)
+
+    total_businesses = Column(Integer, nullable=False, default=0)
+    suspended_businesses = Column(Integer, nullable=False, default=0)
+
+    total_revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    revenue_last_30_days = Column(Numeric(14, 2), nullable=False, default=0)
+
+    total_subscription_revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    active_premium_subscriptions = Column(Integer, nullable=False, default=0)
+    active_weekly_businesses = Column(Integer, nullable=False, default=0)
+    active_monthly_businesses = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -35,11 +35,11 @@ class Product(Base):
     cost_price = Column(Numeric(10, 2), nullable=False)
     selling_price = Column(Numeric(10, 2), nullable=False)
 
+    # Indexed by ix_products_business below
     business_id = Column(
         Integer,
         ForeignKey("businesses.id"),
         nullable=False,
-        index=True,
     )
 
     created_at = Column(
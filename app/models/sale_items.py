@@ -1,6 +1,6 @@
 # app/models/sale_items.py
 
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, CheckConstraint, String
+from sqlalchemy import Column, Index, Integer, ForeignKey, Numeric, CheckConstraint, String
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -14,7 +14,6 @@ class SaleItem(Base):
         Integer,
         ForeignKey("sales.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     product_id = Column(
@@ -35,9 +34,19 @@ class SaleItem(Base):
     selling_price = Column(Numeric(10, 2), nullable=False)
     line_total = Column(Numeric(10, 2), nullable=False)
 
+    # Product cost price at the time of sale; reports sum cost from here,
+    # so later price edits don't rewrite historical profit
+    cost_price = Column(Numeric(10, 2), nullable=False)
+
     sale = relationship("Sale", back_populates="items")
     product = relationship("Product")
 
     __table_args__ = (
         CheckConstraint("quantity > 0", name="ck_saleitem_quantity_positive"),
+        # Covers the sale -> items joins in report aggregates (index-only scans)
+        Index(
+            "ix_sale_items_sale_id_covering",
+            "sale_id",
+            postgresql_include=["product_id", "quantity", "line_total", "cost_price"],
+        ),
     )
\ No newline at end of file
@@ -12,7 +12,8 @@ class Sale(Base):
 
     id = Column(Integer, primary_key=True, index=True)
 
-    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False, index=True)
+    # Leading column of ix_sales_business_created, which serves business-only lookups too
+    business_id = Column(Integer, ForeignKey("businesses.id"), nullable=False)
 
     total_amount = Column(Numeric(10, 2), nullable=False)
 
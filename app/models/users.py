@@ -1,6 +1,6 @@
 # app/models/users.py
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Index, Integer, LargeBinary, String, DateTime, ForeignKey, Boolean, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -17,6 +17,7 @@ class User(Base):
         Integer, 
         ForeignKey("businesses.id", ondelete="CASCADE"), 
         nullable=False,
+        index=True,
     )
 
     phone_number = Column(String, unique=True, nullable=True, index=True)
@@ -24,10 +25,23 @@ class User(Base):
     # Admin flag to differentiate between regular users and business owners
     is_admin = Column(Boolean, default=False, nullable=False)
 
-    reset_token_hash = Column(String, nullable=True)
+    # Reset tokens are emailed as "{selector}.{verifier}": the selector is
+    # looked up directly, only the verifier's SHA-256 digest is stored
+    reset_token_selector = Column(String, nullable=True)
+    reset_token_hash = Column(LargeBinary, nullable=True)
     reset_token_expires_at = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     business = relationship("Business")
+
+    __table_args__ = (
+        # Partial index: only users with an outstanding reset token
+        Index(
+            "ix_users_reset_token_selector",
+            "reset_token_selector",
+            unique=True,
+            postgresql_where=text("reset_token_selector IS NOT NULL"),
+        ),
+    )
     
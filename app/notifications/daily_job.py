@@ -1,3 +1,4 @@
+from app.utils.dates import day_range
 from app.utils.phone import format_nigerian_phone
 
 from datetime import datetime, timezone
@@ -19,6 +20,9 @@ def run_daily_notifications():
     db: Session = SessionLocal()
 
     today = datetime.now(timezone.utc).date()
+    # Half-open range so the (business_id, created_at) index is usable;
+    # wrapping created_at in date() ruled it out
+    start_dt, end_dt = day_range(today, today)
 
     users = db.query(User).all()
 
@@ -37,7 +41,8 @@ def run_daily_notifications():
             db.query(func.coalesce(func.sum(Sale.total_amount), 0))
             .filter(
                 Sale.business_id == user.business_id,
-                func.date(Sale.created_at) == today
+                Sale.created_at >= start_dt,
+                Sale.created_at < end_dt,
             )
             .scalar()
         )
@@ -47,19 +52,20 @@ def run_daily_notifications():
             db.query(func.count(Sale.id))
             .filter(
                 Sale.business_id == user.business_id,
-                func.date(Sale.created_at) == today
+                Sale.created_at >= start_dt,
+                Sale.created_at < end_dt,
             )
             .scalar()
         )
 
         # PROFIT
         cost_total = (
-            db.query(func.coalesce(func.sum(Product.cost_price * SaleItem.quantity), 0))
-            .join(SaleItem, SaleItem.product_id == Product.id)
+            db.query(func.coalesce(func.sum(SaleItem.cost_price * SaleItem.quantity), 0))
             .join(Sale, SaleItem.sale_id == Sale.id)
             .filter(
                 Sale.business_id == user.business_id,
-                func.date(Sale.created_at) == today
+                Sale.created_at >= start_dt,
+                Sale.created_at < end_dt,
             )
             .scalar()
         )
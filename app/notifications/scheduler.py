@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.notifications.daily_job import run_daily_notifications
+from app.core.platform_stats import run_platform_stats_refresh
 
 
 scheduler = BackgroundScheduler()
@@ -19,4 +22,14 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    # Keeps the admin overview row fresh (also runs once at startup)
+    scheduler.add_job(
+        run_platform_stats_refresh,
+        trigger="interval",
+        minutes=5,
+        next_run_time=datetime.now(),
+        id="platform_stats_refresh",
+        replace_existing=True,
+    )
+
     scheduler.start()
\ No newline at end of file
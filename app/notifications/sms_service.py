@@ -3,6 +3,9 @@ from app.core.config import settings
 
 TERMII_URL = "https://api.termii.com/api/sms/send"
 
+# Reused across sends so the daily job keeps one TLS connection to Termii
+_session = requests.Session()
+
 
 def send_sms(phone_number: str, message: str):
 
@@ -22,7 +25,7 @@ def send_sms(phone_number: str, message: str):
     print("Payload:", safe_payload)
 
     try:
-        response = requests.post(TERMII_URL, json=payload, timeout=10)
+        response = _session.post(TERMII_URL, json=payload, timeout=10)
         print("Termii response:", response.text)
     except Exception as e:
         print("SMS sending failed:", e)
\ No newline at end of file
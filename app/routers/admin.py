@@ -1,12 +1,16 @@
 # app/routers/admin.py
 
+import threading
+
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import func, select, true, update
+from datetime import datetime, timedelta
 
 from app.database import get_db
-from app.core.auth import get_admin_user
+from app.core.auth import get_admin_user, invalidate_cached_business
+from app.core.platform_stats import adjust_suspended_businesses, get_platform_stats
 from app.models.business import Business
 from app.models.users import User
 from app.models.products import Product
@@ -17,6 +21,28 @@ from app.models.export_access import ExportAccess
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
+# search -> total matching businesses, for cursor pages that can't count
+_business_count_cache = TTLCache(maxsize=256, ttl=30)
+_business_count_cache_lock = threading.Lock()
+
+
+def _count_businesses(db: Session, search: str | None) -> int:
+    with _business_count_cache_lock:
+        total = _business_count_cache.get(search)
+
+    if total is not None:
+        return total
+
+    count_query = select(func.count(Business.id))
+    if search:
+        count_query = count_query.where(Business.name.ilike(f"%{search}%"))
+    total = db.execute(count_query).scalar_one()
+
+    with _business_count_cache_lock:
+        _business_count_cache[search] = total
+
+    return total
+
 
 # =========================================================
 # PLATFORM OVERVIEW (ROLLING 30 DAYS)
@@ -27,46 +53,14 @@ def platform_overview(
     db: Session = Depends(get_db),
     admin = Depends(get_admin_user),
 ):
-    today = datetime.now(timezone.utc).date()
-    start_30 = today - timedelta(days=29)
-
-    total_businesses = db.query(func.count(Business.id)).scalar()
-    suspended_businesses = db.query(func.count(Business.id)).filter(
-        Business.is_suspended == True
-    ).scalar()
+    # Served from the precomputed platform_stats row (see app/core/platform_stats.py)
+    stats = get_platform_stats(db)
 
+    total_businesses = stats.total_businesses
+    suspended_businesses = stats.suspended_businesses
     active_businesses = total_businesses - suspended_businesses
 
-    total_revenue = db.query(
-        func.coalesce(func.sum(Sale.total_amount), 0)
-    ).scalar()
-
-    revenue_last_30 = db.query(
-        func.coalesce(func.sum(Sale.total_amount), 0)
-    ).filter(
-        Sale.created_at >= start_30
-    ).scalar()
-
-    total_subscription_revenue = db.query(
-        func.coalesce(func.sum(ExportAccess.amount_paid), 0)
-    ).scalar()
-
-    active_premium = db.query(func.count(func.distinct(ExportAccess.business_id))).filter(
-        ExportAccess.start_date <= today,
-        ExportAccess.end_date >= today,
-    ).scalar()
-
-    active_weekly = db.query(func.count(func.distinct(ExportAccess.business_id))).filter(
-        ExportAccess.period_type == "weekly",
-        ExportAccess.start_date <= today,
-        ExportAccess.end_date >= today,
-    ).scalar()
-
-    active_monthly = db.query(func.count(func.distinct(ExportAccess.business_id))).filter(
-        ExportAccess.period_type == "monthly",
-        ExportAccess.start_date <= today,
-        ExportAccess.end_date >= today,
-    ).scalar()
+    active_premium = stats.active_premium_subscriptions
 
     premium_penetration = (
         (active_premium / total_businesses) * 100
@@ -77,13 +71,14 @@ def platform_overview(
         "total_businesses": total_businesses,
         "active_businesses": active_businesses,
         "suspended_businesses": suspended_businesses,
-        "total_revenue": float(total_revenue),
-        "revenue_last_30_days": float(revenue_last_30),
-        "total_subscription_revenue": float(total_subscription_revenue),
+        "total_revenue": float(stats.total_revenue),
+        "revenue_last_30_days": float(stats.revenue_last_30_days),
+        "total_subscription_revenue": float(stats.total_subscription_revenue),
         "active_premium_subscriptions": active_premium,
-        "active_weekly_businesses": active_weekly,
-        "active_monthly_businesses": active_monthly,
+        "active_weekly_businesses": stats.active_weekly_businesses,
+        "active_monthly_businesses": stats.active_monthly_businesses,
         "premium_penetration_percent": round(premium_penetration, 2),
+        "stats_updated_at": stats.updated_at,
     }
 
 
@@ -94,6 +89,7 @@ def list_businesses(
     search: str = None,
     page: int = 1,
     limit: int = 10,
+    cursor: int | None = None,
     db: Session = Depends(get_db),
     admin = Depends(get_admin_user),
 ):
@@ -103,71 +99,149 @@ def list_businesses(
     if limit < 1 or limit > 50:
         limit = 10
 
-    query = db.query(Business)
+    # One UTC date for every row in this page
+    today = datetime.utcnow().date()
+
+    # Per-business details as LATERAL subqueries: evaluated only for the
+    # businesses on this page, all in the same statement as the page itself
+    owner = (
+        select(User.email.label("owner_email"))
+        .where(
+            User.business_id == Business.id,
+            User.is_admin == False,
+        )
+        .order_by(User.id)
+        .limit(1)
+        .lateral("owner")
+    )
 
-    if search:
-        query = query.filter(Business.name.ilike(f"%{search}%"))
+    user_totals = (
+        select(func.count(User.id).label("total_users"))
+        .where(User.business_id == Business.id)
+        .lateral("user_totals")
+    )
 
-    total_records = query.count()
+    product_totals = (
+        select(func.count(Product.id).label("total_products"))
+        .where(Product.business_id == Business.id)
+        .lateral("product_totals")
+    )
 
-    businesses = (
-        query
-        .offset((page - 1) * limit)
-        .limit(limit)
-        .all()
+    sale_totals = (
+        select(
+            func.count(Sale.id).label("total_sales"),
+            func.coalesce(func.sum(Sale.total_amount), 0).label("total_revenue"),
+        )
+        .where(Sale.business_id == Business.id)
+        .lateral("sale_totals")
     )
 
-    results = []
+    active_subscription = (
+        select(
+            ExportAccess.period_type.label("subscription_type"),
+            ExportAccess.end_date.label("subscription_expires_at"),
+        )
+        .where(
+            ExportAccess.business_id == Business.id,
+            ExportAccess.start_date <= today,
+            ExportAccess.end_date >= today,
+        )
+        .order_by(ExportAccess.end_date.desc())
+        .limit(1)
+        .lateral("active_subscription")
+    )
 
-    for biz in businesses:
+    # Filtered page of ids. With a cursor (last business_id of the
+    # previous page) this is a keyset seek on the primary key; page mode
+    # keeps OFFSET and gets the filtered total alongside (COUNT OVER runs
+    # before LIMIT). Kept in its own subquery so the LATERALs below only
+    # run for the page, not every matching business. One extra id is
+    # fetched to tell whether a next page exists.
+    page_ids = select(Business.id)
 
-        owner = db.query(User).filter(
-            User.business_id == biz.id,
-            User.is_admin == False
-        ).first()
+    if search:
+        page_ids = page_ids.where(Business.name.ilike(f"%{search}%"))
+
+    if cursor is not None:
+        page_ids = page_ids.where(Business.id > cursor)
+    else:
+        page_ids = (
+            page_ids
+            .add_columns(func.count().over().label("total_records"))
+            .offset((page - 1) * limit)
+        )
+
+    page_ids = (
+        page_ids
+        .order_by(Business.id)
+        .limit(limit + 1)
+        .subquery("page_ids")
+    )
 
-        total_users = db.query(User).filter(
-            User.business_id == biz.id
-        ).count()
+    columns = [
+        Business,
+        owner.c.owner_email,
+        user_totals.c.total_users,
+        product_totals.c.total_products,
+        sale_totals.c.total_sales,
+        sale_totals.c.total_revenue,
+        active_subscription.c.subscription_type,
+        active_subscription.c.subscription_expires_at,
+    ]
+
+    if cursor is None:
+        columns.append(page_ids.c.total_records)
+
+    rows = (
+        db.query(*columns)
+        .join(page_ids, page_ids.c.id == Business.id)
+        # Aggregates always return a row; owner/subscription may not
+        .outerjoin(owner, true())
+        .join(user_totals, true())
+        .join(product_totals, true())
+        .join(sale_totals, true())
+        .outerjoin(active_subscription, true())
+        .order_by(Business.id)
+        .all()
+    )
 
-        total_products = db.query(Product).filter(
-            Product.business_id == biz.id
-        ).count()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = rows[-1].Business.id
 
-        total_sales = db.query(Sale).filter(
-            Sale.business_id == biz.id
-        ).count()
+    if cursor is None and rows:
+        total_records = rows[0].total_records
+    elif cursor is None and page == 1:
+        total_records = 0
+    else:
+        # Cursor pages and pages past the end have no row carrying it
+        total_records = _count_businesses(db, search)
 
-        total_revenue = db.query(
-            func.coalesce(func.sum(Sale.total_amount), 0)
-        ).filter(
-            Sale.business_id == biz.id
-        ).scalar()
+    results = []
 
-        active_subscription = db.query(ExportAccess).filter(
-            ExportAccess.business_id == biz.id,
-            ExportAccess.start_date <= date.today(),
-            ExportAccess.end_date >= date.today(),
-        ).first()
+    for row in rows:
+        biz = row.Business
 
         results.append({
             "business_id": biz.id,
             "business_name": biz.name,
-            "owner_email": owner.email if owner else None,
+            "owner_email": row.owner_email,
             "created_at": biz.created_at,
             "is_suspended": biz.is_suspended,
-            "total_users": total_users,
-            "total_products": total_products,
-            "total_sales": total_sales,
-            "total_revenue": float(total_revenue),
-            "subscription_type": active_subscription.period_type if active_subscription else None,
-            "subscription_expires_at": active_subscription.end_date if active_subscription else None,
+            "total_users": row.total_users,
+            "total_products": row.total_products,
+            "total_sales": row.total_sales,
+            "total_revenue": float(row.total_revenue),
+            "subscription_type": row.subscription_type,
+            "subscription_expires_at": row.subscription_expires_at,
         })
 
     return {
         "page": page,
         "limit": limit,
         "total_records": total_records,
+        "next_cursor": next_cursor,
         "data": results
     }
 
@@ -175,19 +249,39 @@ def list_businesses(
 # SUSPEND / ACTIVATE BUSINESS
 # =========================================================
 
+def _set_suspended(db: Session, business_id: int, suspended: bool):
+    # Only a real change matches, so repeated calls don't double-count
+    changed = db.execute(
+        update(Business)
+        .where(
+            Business.id == business_id,
+            Business.is_suspended.is_distinct_from(suspended),
+        )
+        .values(is_suspended=suspended)
+        .returning(Business.id)
+    ).first()
+
+    if changed is None:
+        if db.get(Business, business_id) is None:
+            raise HTTPException(status_code=404, detail="Business not found")
+
+        # Already in the requested state
+        return
+
+    # Same transaction as the flag, so the counter can't drift from it
+    adjust_suspended_businesses(db, 1 if suspended else -1)
+    db.commit()
+
+    invalidate_cached_business(business_id)
+
+
 @router.post("/business/{business_id}/suspend")
 def suspend_business(
     business_id: int,
     db: Session = Depends(get_db),
     admin = Depends(get_admin_user),
 ):
-    business = db.query(Business).filter(Business.id == business_id).first()
-
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-
-    business.is_suspended = True
-    db.commit()
+    _set_suspended(db, business_id, True)
 
     return {"message": "Business suspended successfully"}
 
@@ -198,13 +292,7 @@ def activate_business(
     db: Session = Depends(get_db),
     admin = Depends(get_admin_user),
 ):
-    business = db.query(Business).filter(Business.id == business_id).first()
-
-    if not business:
-        raise HTTPException(status_code=404, detail="Business not found")
-
-    business.is_suspended = False
-    db.commit()
+    _set_suspended(db, business_id, False)
 
     return {"message": "Business reactivated successfully"}
 
@@ -218,24 +306,26 @@ def business_financial_overview(
     db: Session = Depends(get_db),
     admin = Depends(get_admin_user),
 ):
-    today = datetime.now(timezone.utc).date()
+    today = datetime.utcnow().date()
     start_30 = today - timedelta(days=29)
 
-    revenue = db.query(
-        func.coalesce(func.sum(Sale.total_amount), 0)
-    ).filter(
-        Sale.business_id == business_id,
-        Sale.created_at >= start_30
-    ).scalar()
-
-    cost = db.query(
-        func.coalesce(func.sum(Product.cost_price * SaleItem.quantity), 0)
-    ).join(SaleItem, SaleItem.product_id == Product.id
-    ).join(Sale, SaleItem.sale_id == Sale.id
-    ).filter(
-        Sale.business_id == business_id,
-        Sale.created_at >= start_30
-    ).scalar()
+    revenue = db.execute(
+        select(func.coalesce(func.sum(Sale.total_amount), 0))
+        .where(
+            Sale.business_id == business_id,
+            Sale.created_at >= start_30
+        )
+    ).scalar_one()
+
+    cost = db.execute(
+        select(func.coalesce(func.sum(SaleItem.cost_price * SaleItem.quantity), 0))
+        .select_from(SaleItem)
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .where(
+            Sale.business_id == business_id,
+            Sale.created_at >= start_30
+        )
+    ).scalar_one()
 
     profit = revenue - cost
 
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
 import secrets
 import logging
 
@@ -17,18 +19,19 @@ from app.core.rate_limiter import limiter
 from app.core.config import settings
 from app.core.email import send_password_reset_email
 from app.core.current_user import get_current_user
+from app.core.auth import invalidate_cached_user
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
-COMMON_PASSWORDS = {
+COMMON_PASSWORDS = frozenset({
     "password",
     "password123",
     "12345678",
     "qwerty123",
     "admin123",
-}
+})
 
 # ---------------- SIGNUP ----------------
 @router.post("/signup", status_code=status.HTTP_201_CREATED)
@@ -48,23 +51,24 @@ def signup(request: Request, user_data: UserCreate, db: Session = Depends(get_db
             detail="Password cannot be numbers only.",
         )
 
-    if db.query(User).filter(User.email == user_data.email).first():
+    # Format phone number
+    formatted_phone = format_nigerian_phone(user_data.phone_number)
+
+    # Email, business name and phone uniqueness in one round-trip
+    taken = db.query(
+        db.query(User).filter(User.email == user_data.email).exists().label("email"),
+        db.query(Business).filter(Business.name == user_data.business_name).exists().label("business_name"),
+        db.query(User).filter(User.phone_number == formatted_phone).exists().label("phone_number"),
+    ).one()
+
+    if taken.email:
         raise HTTPException(status_code=409, detail="Email already exists")
 
-    if db.query(Business).filter(Business.name == user_data.business_name).first():
+    if taken.business_name:
         raise HTTPException(status_code=409, detail="Business name already exists")
 
-    # Format phone number
-    formatted_phone = format_nigerian_phone(user_data.phone_number)
-
     # Check if phone number already exists
-    existing_phone = (
-        db.query(User)
-        .filter(User.phone_number == formatted_phone)
-        .first()
-    )
-
-    if existing_phone:
+    if taken.phone_number:
         raise HTTPException(
             status_code=409,
             detail="Phone number already used by another business"
@@ -122,16 +126,37 @@ def logout():
 
 
 # ---------------- FORGOT PASSWORD ----------------
+def _hash_reset_verifier(verifier: str) -> bytes:
+    # Verifiers are 256-bit random values, so a fast digest is enough
+    return hashlib.sha256(verifier.encode()).digest()
+
+
+async def _send_reset_email(to_email: str, reset_link: str):
+    try:
+        await send_password_reset_email(to_email, reset_link)
+    except Exception as e:
+        # Log error but don't crash the background task
+        logger.error(f"Failed to send password reset email: {str(e)}")
+
+
 @router.post("/forgot-password")
 @limiter.limit("3/minute")
-def forgot_password(request: Request, email: str, db: Session = Depends(get_db)):
+def forgot_password(
+    request: Request,
+    email: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+):
     user = db.query(User).filter(User.email == email).first()
 
     if user:
-        raw_token = secrets.token_urlsafe(32)
-        token_hash = hash_password(raw_token)
+        # Split token: selector finds the row, verifier proves possession
+        selector = secrets.token_urlsafe(16)
+        verifier = secrets.token_urlsafe(32)
+        raw_token = f"{selector}.{verifier}"
 
-        user.reset_token_hash = token_hash
+        user.reset_token_selector = selector
+        user.reset_token_hash = _hash_reset_verifier(verifier)
         user.reset_token_expires_at = datetime.now(timezone.utc) + timedelta(
             minutes=settings.PASSWORD_RESET_EXPIRE_MINUTES
         )
@@ -139,12 +164,9 @@ def forgot_password(request: Request, email: str, db: Session = Depends(get_db))
         db.commit()
 
         reset_link = f"{settings.FRONTEND_RESET_URL}?token={raw_token}"
-    try:    
-        send_password_reset_email(user.email, reset_link)
-    except Exception as e:
-        # Log error but don't crash endpoint
-        logger.error(f"Failed to send password reset email: {str(e)}")
-        
+
+        # Sent after the response so Resend latency never reaches the client
+        background_tasks.add_task(_send_reset_email, user.email, reset_link)
 
     return {"message": "If the email exists, a reset link has been sent."}
 
@@ -158,32 +180,42 @@ def reset_password(
     new_password: str,
     db: Session = Depends(get_db),
 ):
-    users = db.query(User).filter(User.reset_token_expires_at.isnot(None)).all()
+    selector, _, verifier = token.partition(".")
 
     matched_user = None
-    
-    # Iterate through users with valid reset tokens to find a match
-    for u in users:
-        if (
-            u.reset_token_expires_at
-            and u.reset_token_expires_at > datetime.utcnow()
-            and verify_password(token, u.reset_token_hash)
-        ):
-            matched_user = u
-            break
-
-    if not matched_user:
+
+    if selector and verifier:
+        # Single row via ix_users_reset_token_selector
+        matched_user = (
+            db.query(User)
+            .filter(User.reset_token_selector == selector)
+            .first()
+        )
+
+    if (
+        not matched_user
+        or not matched_user.reset_token_hash
+        or not hmac.compare_digest(
+            matched_user.reset_token_hash,
+            _hash_reset_verifier(verifier),
+        )
+        or not matched_user.reset_token_expires_at
+        or matched_user.reset_token_expires_at <= datetime.utcnow()
+    ):
         raise HTTPException(
             status_code=400,
             detail="Invalid or expired reset token",
         )
 
     matched_user.password_hash = hash_password(new_password)
+    matched_user.reset_token_selector = None
     matched_user.reset_token_hash = None
     matched_user.reset_token_expires_at = None
 
     db.commit()
 
+    invalidate_cached_user(matched_user.id)
+
     return {"message": "Password reset successful. Please login."}
 
 
@@ -6,10 +6,8 @@ from app.core.auth import get_current_user
 from app.models.products import Product
 from app.models.inventory import Inventory
 from app.models.sales import Sale
-from app.core.subscription import get_active_subscription
+from app.core.subscription import free_tier_cutoff, get_active_subscription
 
-from datetime import datetime, timedelta
-import pytz
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -37,9 +35,7 @@ def dashboard_summary(
     )
 
     if not subscription:
-        tz = pytz.timezone('Africa/Lagos')
-        seven_days_ago = datetime.now(tz) - timedelta(days=6)
-        query = query.filter(Sale.created_at >= seven_days_ago)
+        query = query.filter(Sale.created_at >= free_tier_cutoff())
 
     sales = query.all()
 
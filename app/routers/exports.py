@@ -1,25 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import BigInteger, cast, false, func, select
+from collections.abc import Iterable
 from datetime import date, timedelta, datetime, timezone
 from decimal import Decimal
-from io import BytesIO
-
-from openpyxl import Workbook
-from fastapi.responses import StreamingResponse
-
-from app.database import get_db
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import Literal
+import hashlib
+import hmac
+import logging
+import os
+import re
+import tempfile
+import time
+
+from fastapi.responses import FileResponse, StreamingResponse
+
+from app.database import SessionLocal, get_db
+from app.core.config import settings
 from app.core.auth import get_current_user
-from app.core.subscription import get_active_subscription
+from app.core.subscription import get_active_subscription, require_subscription
+from app.core.report_cache import load_data_version
 from app.models.sales import Sale
 from app.models.sale_items import SaleItem
 from app.models.products import Product
-from app.models.export_access import ExportAccess
 from app.models.product_units import ProductUnitConversion
+from app.models.daily_business_rollup import DailyBusinessRollup
 from app.core.rate_limiter import limiter
+from app.utils.dates import day_range
+from app.utils.money import percentage, to_naira
+from app.utils.xlsx import StreamingWorkbook
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/exports", tags=["Exports"])
 
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+EXPORT_SALES_BATCH_SIZE = 500
+# Fastest deflate level: XML compresses well even at 1, at a fraction
+# of the CPU of the default 6
+EXPORT_COMPRESS_LEVEL = 1
+EXPORT_CHUNK_SIZE = 64 * 1024
+EXPORT_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
 
 # =========================================================
 # UNIT CONVERSION HELPER
@@ -102,31 +127,9 @@ def fetch_units_for_products(db: Session, product_ids: list):
 # =========================================================
 
 def _require_export_access(db: Session, business_id: int, period_type: str):
-    today = datetime.now(timezone.utc).date()
-
-    # If requesting weekly export, check for weekly OR monthly subscription
-    if period_type == "weekly":
-        access = (
-            db.query(ExportAccess)
-            .filter(
-                ExportAccess.business_id == business_id,
-                ExportAccess.start_date <= today,
-                ExportAccess.end_date >= today,
-                ExportAccess.period_type.in_(["weekly", "monthly"])  # ← KEY CHANGE
-            )
-            .first()
-        )
-    else:  # monthly
-        access = (
-            db.query(ExportAccess)
-            .filter(
-                ExportAccess.business_id == business_id,
-                ExportAccess.period_type == "monthly",
-                ExportAccess.start_date <= today,
-                ExportAccess.end_date >= today,
-            )
-            .first()
-        )
+    # Weekly exports are covered by a weekly OR monthly subscription;
+    # the shared subscription cache answers repeat checks without a query
+    access = require_subscription(db, business_id, period_type)
 
     if not access:
         raise HTTPException(
@@ -148,9 +151,9 @@ def export_daily_sales(request: Request, db: Session = Depends(get_db), current_
 @router.get("/weekly")
 @limiter.limit("5/minute")
 def export_weekly_sales(request: Request, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    today = datetime.now(timezone.utc).date()
     _require_export_access(db, current_user.business_id, "weekly")
 
-    today = datetime.now(timezone.utc).date()
     start_date = today - timedelta(days=6)
     return _generate_export(db, current_user.business_id, "weekly", start_date, today)
 
@@ -158,78 +161,326 @@ def export_weekly_sales(request: Request, db: Session = Depends(get_db), current
 @router.get("/monthly")
 @limiter.limit("5/minute")
 def export_monthly_sales(request: Request, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+    today = datetime.now(timezone.utc).date()
     _require_export_access(db, current_user.business_id, "monthly")
 
-    today = datetime.now(timezone.utc).date()
     start_date = today - timedelta(days=29)
     return _generate_export(db, current_user.business_id, "monthly", start_date, today)
 
 
+# =========================================================
+# BACKGROUND EXPORT JOBS
+# =========================================================
+# Job state lives on disk so every worker on the host sees it:
+#   {job_id}.pending -> generating, {job_id}.xlsx -> done,
+#   {job_id}.failed  -> last attempt failed
+# A job id is deterministic per business/period/window, so repeated
+# requests reuse the same file while it is fresh.
+
+EXPORT_DIR = Path(settings.EXPORT_DIR or Path(tempfile.gettempdir()) / "saleszy_exports")
+
+EXPORT_PERIOD_DAYS = {
+    "daily": 0,
+    "weekly": 6,
+    "monthly": 29,
+}
+
+EXPORT_JOB_ID_PATTERN = re.compile(
+    r"^\d+_(daily|weekly|monthly)_sales_\d{4}-\d{2}-\d{2}_to_\d{4}-\d{2}-\d{2}_v\d+$"
+)
+
+_EXPORT_SIGNING_KEY = settings.SECRET_KEY.encode()
+
+
+def _export_job_path(job_id: str, suffix: str) -> Path:
+    return EXPORT_DIR / f"{job_id}{suffix}"
+
+
+def _export_job_state(job_id: str) -> str | None:
+    max_age = settings.EXPORT_CACHE_TTL_MINUTES * 60
+    now = time.time()
+
+    for suffix, state in ((".xlsx", "done"), (".failed", "failed"), (".pending", "pending")):
+        try:
+            modified_at = _export_job_path(job_id, suffix).stat().st_mtime
+        except FileNotFoundError:
+            continue
+
+        # Expired files (and pending markers left by a crashed worker)
+        # count as missing
+        if now - modified_at < max_age:
+            return state
+
+    return None
+
+
+def _export_signature(job_id: str, expires: int) -> str:
+    return hmac.new(
+        _EXPORT_SIGNING_KEY,
+        f"{job_id}:{expires}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+def _purge_expired_exports():
+    max_age = settings.EXPORT_CACHE_TTL_MINUTES * 60
+    now = time.time()
+
+    for path in EXPORT_DIR.iterdir():
+        try:
+            if now - path.stat().st_mtime >= max_age:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _run_export_job(job_id: str, business_id: int, period_type: str, start_date: date, end_date: date):
+    db: Session = SessionLocal()
+    tmp_path = None
+
+    try:
+        _purge_expired_exports()
+
+        # Unique temp name, then an atomic rename: a reader never sees a
+        # half-written file, even if two workers race on the same job
+        with tempfile.NamedTemporaryFile(dir=EXPORT_DIR, suffix=".tmp", delete=False) as output:
+            tmp_path = output.name
+            _write_export(db, business_id, period_type, start_date, end_date, output)
+
+        os.replace(tmp_path, _export_job_path(job_id, ".xlsx"))
+
+    except Exception:
+        logger.exception("Export job %s failed", job_id)
+        _export_job_path(job_id, ".failed").touch()
+
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+
+    finally:
+        _export_job_path(job_id, ".pending").unlink(missing_ok=True)
+        db.close()
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit("5/minute")
+def start_export_job(
+    request: Request,
+    period_type: Literal["daily", "weekly", "monthly"],
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    today = datetime.now(timezone.utc).date()
+
+    if period_type != "daily":
+        _require_export_access(db, current_user.business_id, period_type)
+
+    start_date = today - timedelta(days=EXPORT_PERIOD_DAYS[period_type])
+    # The stored data version changes with every sale/product/stock write,
+    # so a finished file is only reused while it still matches the data
+    version = load_data_version(db, current_user.business_id)
+    job_id = f"{current_user.business_id}_{period_type}_sales_{start_date}_to_{today}_v{version}"
+
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+
+    state = _export_job_state(job_id)
+
+    if state is None or state == "failed":
+        _export_job_path(job_id, ".failed").unlink(missing_ok=True)
+        _export_job_path(job_id, ".pending").touch()
+
+        # Runs after the response is sent, in the threadpool
+        background_tasks.add_task(
+            _run_export_job,
+            job_id,
+            current_user.business_id,
+            period_type,
+            start_date,
+            today,
+        )
+        state = "pending"
+
+    return {
+        "job_id": job_id,
+        "state": state,
+        "status_url": str(request.url_for("get_export_job", job_id=job_id)),
+    }
+
+
+@router.get("/jobs/{job_id}")
+def get_export_job(
+    request: Request,
+    job_id: str,
+    current_user=Depends(get_current_user),
+):
+    state = None
+
+    # Job ids start with the owning business id
+    if (
+        EXPORT_JOB_ID_PATTERN.match(job_id)
+        and job_id.split("_", 1)[0] == str(current_user.business_id)
+    ):
+        state = _export_job_state(job_id)
+
+    if state is None:
+        raise HTTPException(status_code=404, detail="Export job not found")
+
+    response = {"job_id": job_id, "state": state}
+
+    if state == "done":
+        expires = int(time.time()) + settings.EXPORT_URL_EXPIRE_MINUTES * 60
+        response["url"] = str(
+            request.url_for("download_export_job", job_id=job_id).include_query_params(
+                expires=expires,
+                signature=_export_signature(job_id, expires),
+            )
+        )
+
+    return response
+
+
+# Authorized by the signed URL alone, so it can be opened directly by a browser
+@router.get("/jobs/{job_id}/file")
+def download_export_job(job_id: str, expires: int, signature: str):
+    if (
+        not EXPORT_JOB_ID_PATTERN.match(job_id)
+        or expires < time.time()
+        # As bytes: compare_digest raises TypeError on non-ASCII str
+        or not hmac.compare_digest(
+            signature.encode(),
+            _export_signature(job_id, expires).encode(),
+        )
+    ):
+        raise HTTPException(status_code=403, detail="Invalid or expired download link")
+
+    path = _export_job_path(job_id, ".xlsx")
+
+    if _export_job_state(job_id) != "done" or not path.exists():
+        raise HTTPException(status_code=404, detail="Export no longer available")
+
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"{job_id.split('_', 1)[1].rsplit('_v', 1)[0]}.xlsx",
+    )
+
+
 # =========================================================
 # CORE EXPORT GENERATOR
 # =========================================================
 def _generate_export(db: Session, business_id: int, period_type: str, start_date: date, end_date: date):
+    # Kept in memory up to EXPORT_SPOOL_MAX_SIZE, spilled to disk beyond
+    output = SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
+    _write_export(db, business_id, period_type, start_date, end_date, output)
+    output.seek(0)
 
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date, datetime.max.time())
+    return StreamingResponse(
+        _iter_file(output),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{period_type}_sales_{start_date}_to_{end_date}.xlsx"'
+        },
+    )
 
-    sales = (
-        db.query(Sale)
-        .options(joinedload(Sale.items).joinedload(SaleItem.product))
-        .filter(
-            Sale.business_id == business_id,
-            Sale.created_at.between(start_dt, end_dt),
-        )
-        .all()
+
+def _write_export(db: Session, business_id: int, period_type: str, start_date: date, end_date: date, output):
+
+    start_dt, end_dt = day_range(start_date, end_date)
+
+    sale_filters = (
+        Sale.business_id == business_id,
+        Sale.created_at >= start_dt,
+        Sale.created_at < end_dt,
     )
-    
-    # Get all unique product IDs from sales
-    product_ids = set()
-    for sale in sales:
-        for item in sale.items:
-            if item.product_id:
-                product_ids.add(item.product_id)
-    
+
+    # Server-side cursor, fetched in batches of EXPORT_SALES_BATCH_SIZE
+    # while the sheet is written; the selectinloads run once per batch
+    sales = db.execute(
+        select(Sale)
+        # Items in one IN query per batch; products come from products_by_id
+        .options(selectinload(Sale.items))
+        .where(*sale_filters)
+        .execution_options(yield_per=EXPORT_SALES_BATCH_SIZE)
+    ).scalars()
+
+    # Product ids come from SQL so nothing needs the full list of sales
+    # in memory
+    product_ids = [
+        product_id
+        for (product_id,) in (
+            db.query(SaleItem.product_id)
+            .join(Sale, SaleItem.sale_id == Sale.id)
+            .filter(*sale_filters, SaleItem.product_id.isnot(None))
+            .distinct()
+            .all()
+        )
+    ]
+
+    # Only the columns the sheet reads, as plain rows rather than entities
+    products_by_id = {}
+    if product_ids:
+        products_by_id = {
+            product.id: product
+            for product in (
+                db.query(Product.id, Product.name, Product.base_unit)
+                .filter(Product.id.in_(product_ids))
+                .all()
+            )
+        }
+
     # Fetch all units for these products in one go
-    units_by_product = fetch_units_for_products(db, list(product_ids))
+    units_by_product = fetch_units_for_products(db, product_ids)
 
     subscription = get_active_subscription(db, business_id)
 
     return _build_excel(
         db=db,
         sales=sales,
+        products_by_id=products_by_id,
         units_by_product=units_by_product,
         business_id=business_id,
         subscription=subscription,
         period_type=period_type,
         start_date=start_date,
         end_date=end_date,
-        filename=f"{period_type}_sales_{start_date}_to_{end_date}.xlsx",
+        start_dt=start_dt,
+        end_dt=end_dt,
+        output=output,
     )
 
 
 # =========================================================
 # EXCEL BUILDER
 # =========================================================
+def _kobo_total(column, window):
+    # SUM(bigint) is NUMERIC in Postgres; cast back so totals stay int
+    return cast(func.coalesce(func.sum(column).filter(window), 0), BigInteger)
+
+
 def _build_excel(
     db: Session,
-    sales: list[Sale],
+    sales: Iterable[Sale],
+    products_by_id: dict,
     units_by_product: dict,
     business_id: int,
     subscription,
     period_type: str,
     start_date: date,
     end_date: date,
-    filename: str,
+    start_dt: datetime,
+    end_dt: datetime,
+    output,
 ):
+    """Write the export workbook to output; sales must have items preloaded (selectinload)"""
 
-    workbook = Workbook()
+    # Rows are written as SpreadsheetML straight into the zip as they
+    # are appended: no per-cell objects, memory independent of size
+    workbook = StreamingWorkbook(output, compresslevel=EXPORT_COMPRESS_LEVEL)
 
     # =======================
     # SHEET 1 - RAW SALES
     # =======================
-    sheet = workbook.active
-    sheet.title = "Sales Data"
+    sheet = workbook.add_worksheet("Sales Data")
 
     sheet.append([
         "Date",
@@ -241,26 +492,18 @@ def _build_excel(
         "Total Sale Amount",
     ])
 
-    total_revenue = Decimal("0.00")
-
     for sale in sales:
-        total_revenue += sale.total_amount
+        # Same for every line of the sale; format once
+        sale_date = sale.created_at.date().isoformat()
+        sale_total = f"₦{float(sale.total_amount):,.2f}"
 
         for item in sale.items:
-            product = item.product
+            product = products_by_id.get(item.product_id)
             
             if product:
-                # Create a simple object for the product
-                class SimpleProduct:
-                    def __init__(self, id, base_unit):
-                        self.id = id
-                        self.base_unit = base_unit
-                
-                simple_product = SimpleProduct(product.id, product.base_unit)
-                
                 # Convert quantity to readable format
                 try:
-                    readable_qty = convert_to_readable(item.quantity, simple_product, units_by_product)
+                    readable_qty = convert_to_readable(item.quantity, product, units_by_product)
                 except Exception as e:
                     print(f"Error converting quantity for product {product.id}: {e}")
                     # Fallback to simple format
@@ -272,65 +515,25 @@ def _build_excel(
                 readable_qty = f"{int(item.quantity)} units"
 
             sheet.append([
-                sale.created_at.strftime("%Y-%m-%d"),
+                sale_date,
                 sale.id,
                 product.name if product else "Deleted product",
                 readable_qty,
                 f"₦{float(item.selling_price):,.2f}",
                 f"₦{float(item.line_total):,.2f}",
-                f"₦{float(sale.total_amount):,.2f}",
+                sale_total,
             ])
 
     # =======================
     # SHEET 2 - BUSINESS SUMMARY
     # =======================
-    summary = workbook.create_sheet(title="Business Summary")
+    summary = workbook.add_worksheet("Business Summary")
 
     summary.append(["Period", f"{start_date} to {end_date}"])
     summary.append([])
 
-    # Calculate cost
-    total_cost = (
-        db.query(func.coalesce(func.sum(Product.cost_price * SaleItem.quantity), 0))
-        .join(SaleItem, SaleItem.product_id == Product.id)
-        .join(Sale, SaleItem.sale_id == Sale.id)
-        .filter(
-            Sale.business_id == business_id,
-            Sale.created_at.between(
-                datetime.combine(start_date, datetime.min.time()),
-                datetime.combine(end_date, datetime.max.time()),
-            ),
-        )
-        .scalar()
-    )
-
-    total_cost = Decimal(total_cost or 0)
-    total_profit = total_revenue - total_cost
-
-    if total_revenue == 0:
-        margin = Decimal("0.00")
-    else:
-        margin = ((total_profit / total_revenue) * 100).quantize(Decimal("0.01"))
-
-    # Top Product
-    top_product = (
-        db.query(Product.name, func.sum(SaleItem.line_total).label("revenue"))
-        .join(SaleItem, SaleItem.product_id == Product.id)
-        .join(Sale, SaleItem.sale_id == Sale.id)
-        .filter(
-            Sale.business_id == business_id,
-            Sale.created_at.between(
-                datetime.combine(start_date, datetime.min.time()),
-                datetime.combine(end_date, datetime.max.time()),
-            ),
-        )
-        .group_by(Product.name)
-        .order_by(func.sum(SaleItem.line_total).desc())
-        .first()
-    )
-
     # ======================================================
-    # PROFIT GROWTH CALCULATION (Premium Insight)
+    # SUMMARY AGGREGATES (+ PROFIT GROWTH, Premium Insight)
     # ======================================================
 
     previous_start = None
@@ -348,57 +551,98 @@ def _build_excel(
         previous_start = start_date - timedelta(days=30)
         previous_end = start_date - timedelta(days=1)
 
-    previous_profit = Decimal("0.00")
+    # Revenue and cost come from the daily rollups: at most ~60 rows.
+    # The previous period directly precedes the current one, so one
+    # range covers both and FILTER splits it per period
+    current_days = DailyBusinessRollup.day.between(start_date, end_date)
 
     if previous_start and previous_end:
-        prev_cost = (
-            db.query(func.coalesce(func.sum(Product.cost_price * SaleItem.quantity), 0))
-            .join(SaleItem, SaleItem.product_id == Product.id)
-            .join(Sale, SaleItem.sale_id == Sale.id)
-            .filter(
-                Sale.business_id == business_id,
-                Sale.created_at.between(
-                    datetime.combine(previous_start, datetime.min.time()),
-                    datetime.combine(previous_end, datetime.max.time()),
-                ),
-            )
-            .scalar()
+        scan_start = previous_start
+        previous_days = DailyBusinessRollup.day.between(previous_start, previous_end)
+    else:
+        scan_start = start_date
+        previous_days = false()
+
+    rollup_totals = (
+        select(
+            _kobo_total(DailyBusinessRollup.revenue_kobo, current_days).label("total_revenue"),
+            _kobo_total(DailyBusinessRollup.cost_kobo, current_days).label("total_cost"),
+            _kobo_total(DailyBusinessRollup.revenue_kobo, previous_days).label("prev_revenue"),
+            _kobo_total(DailyBusinessRollup.cost_kobo, previous_days).label("prev_cost"),
+        )
+        .where(
+            DailyBusinessRollup.business_id == business_id,
+            DailyBusinessRollup.day.between(scan_start, end_date),
         )
+        .subquery("rollup_totals")
+    )
 
-        prev_revenue = (
-            db.query(func.coalesce(func.sum(Sale.total_amount), 0))
-            .filter(
-                Sale.business_id == business_id,
-                Sale.created_at.between(
-                    datetime.combine(previous_start, datetime.min.time()),
-                    datetime.combine(previous_end, datetime.max.time()),
-                ),
-            )
-            .scalar()
+    # Per-product ranking can't be kept as a running total, so it stays live.
+    # Grouped on sale_items.product_id (names are unique per business) so
+    # the covering sale_items index serves the aggregate; products is only
+    # touched once, for the winner's name
+    top_product_id = (
+        select(SaleItem.product_id)
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .where(
+            Sale.business_id == business_id,
+            Sale.created_at >= start_dt,
+            Sale.created_at < end_dt,
         )
+        .group_by(SaleItem.product_id)
+        .order_by(func.sum(SaleItem.line_total).desc())
+        .limit(1)
+        .scalar_subquery()
+    )
 
-        prev_cost = Decimal(prev_cost or 0)
-        prev_revenue = Decimal(prev_revenue or 0)
-        previous_profit = prev_revenue - prev_cost
+    top_product = (
+        select(Product.name)
+        .where(Product.id == top_product_id)
+        .scalar_subquery()
+    )
+
+    # Revenue, costs and top product in one round-trip
+    totals = db.execute(
+        select(
+            rollup_totals.c.total_revenue,
+            rollup_totals.c.total_cost,
+            rollup_totals.c.prev_cost,
+            rollup_totals.c.prev_revenue,
+            top_product.label("top_product"),
+        )
+    ).one()
+
+    # Summary totals arrive as int kobo
+    total_revenue = totals.total_revenue
+    total_cost = totals.total_cost
+    total_profit = total_revenue - total_cost
+
+    if total_revenue == 0:
+        margin = 0.0
+    else:
+        margin = percentage(total_profit, total_revenue)
+
+    previous_profit = 0
+
+    if previous_start and previous_end:
+        previous_profit = totals.prev_revenue - totals.prev_cost
 
     if previous_profit == 0:
         if total_profit > 0:
-            profit_growth = Decimal("100.00")
-        else:    
-            profit_growth = Decimal("0.00")
+            profit_growth = 100.0
+        else:
+            profit_growth = 0.0
     else:
-        profit_growth = (
-            ((total_profit - previous_profit) / previous_profit) * 100
-        ).quantize(Decimal("0.01"))
+        profit_growth = percentage(total_profit - previous_profit, previous_profit)
 
-    summary.append(["Total Revenue (₦)", float(total_revenue)])
+    summary.append(["Total Revenue (₦)", to_naira(total_revenue)])
 
     if subscription:
-        summary.append(["Total Cost (₦)", float(total_cost)])
-        summary.append(["Total Profit (₦)", float(total_profit)])
-        summary.append(["Profit Margin (%)", float(margin)])
-        summary.append(["Top Performing Product", top_product[0] if top_product else "N/A"])
-        summary.append(["Profit Growth (%)", float(profit_growth)])
+        summary.append(["Total Cost (₦)", to_naira(total_cost)])
+        summary.append(["Total Profit (₦)", to_naira(total_profit)])
+        summary.append(["Profit Margin (%)", margin])
+        summary.append(["Top Performing Product", totals.top_product or "N/A"])
+        summary.append(["Profit Growth (%)", profit_growth])
     else:
         summary.append(["Total Cost (₦)", " Upgrade to unlock"])
         summary.append(["Total Profit (₦)", " Upgrade to unlock"])
@@ -407,14 +651,14 @@ def _build_excel(
         summary.append(["Profit Growth (%)", " Upgrade to unlock"])
     
     # =======================
-    # RETURN FILE
+    # SAVE FILE
     # =======================
-    output = BytesIO()
-    workbook.save(output)
-    output.seek(0)
+    workbook.close()
 
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
-    )
\ No newline at end of file
+
+def _iter_file(file):
+    try:
+        while chunk := file.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+    finally:
+        file.close()
@@ -13,17 +13,20 @@
 
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import BigInteger, cast, func, select
 from datetime import date, timedelta, datetime, timezone
-from decimal import Decimal
 
 from app.database import get_db
 from app.core.auth import get_current_user
-from app.core.subscription import require_subscription
+from app.core.subscription import require_subscription_async
+from app.core.report_cache import cached_report_async, report_etag
 from app.models.sales import Sale
 from app.models.sale_items import SaleItem
 from app.models.products import Product
 from app.models.inventory import Inventory
+from app.models.daily_business_rollup import DailyBusinessRollup
+from app.utils.dates import day_range
+from app.utils.money import divide_half_even, percentage, ratio, to_naira
 
 router = APIRouter(prefix="/insights", tags=["Insights"])
 
@@ -58,51 +61,24 @@ def _get_period_dates(period: str):
 # =========================================================
 def _get_sales_summary(db, business_id, start_date, end_date):
 
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(end_date, datetime.max.time())
-
-    base_filter = [
-        Sale.business_id == business_id,
-        Sale.created_at.between(start_dt, end_dt),
-    ]
-
-    total_revenue = (
-        db.query(func.coalesce(func.sum(Sale.total_amount), 0))
-        .filter(*base_filter)
-        .scalar()
-    )
-
-    total_orders = (
-        db.query(func.count(Sale.id))
-        .filter(*base_filter)
-        .scalar()
-    )
+    # Read from the daily rollups (one row per day); revenue is int kobo
+    total_revenue, total_orders = db.execute(
+        select(
+            cast(func.coalesce(func.sum(DailyBusinessRollup.revenue_kobo), 0), BigInteger),
+            func.coalesce(func.sum(DailyBusinessRollup.sales_count), 0),
+        ).where(
+            DailyBusinessRollup.business_id == business_id,
+            DailyBusinessRollup.day.between(start_date, end_date),
+        )
+    ).one()
 
-    return Decimal(total_revenue or 0), total_orders or 0
+    return total_revenue, int(total_orders)
 
 
 # =========================================================
-# MAIN INSIGHTS ENDPOINT
+# HELPER: COMPUTE INSIGHTS
 # =========================================================
-@router.get("/summary")
-def insights_summary(
-    period: str = Query(..., pattern="^(weekly|monthly)$"),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-):
-
-    #  Require matching subscription
-    subscription = require_subscription(
-        db,
-        current_user.business_id,
-        period,
-    )
-
-    if not subscription:
-        raise HTTPException(
-            status_code=402,
-            detail="Upgrade to unlock Business Insights",
-        )
+def _build_insights(db, business_id, period):
 
     current_start, current_end, previous_start, previous_end = _get_period_dates(period)
 
@@ -111,14 +87,14 @@ def insights_summary(
     # ----------------------------
     current_revenue, current_orders = _get_sales_summary(
         db,
-        current_user.business_id,
+        business_id,
         current_start,
         current_end,
     )
 
     previous_revenue, _ = _get_sales_summary(
         db,
-        current_user.business_id,
+        business_id,
         previous_start,
         previous_end,
     )
@@ -128,88 +104,130 @@ def insights_summary(
     # ----------------------------
     if previous_revenue == 0:
         if current_revenue > 0:
-            growth_percentage = Decimal("100.00")
+            growth_percentage = 100.0
         else:
-            growth_percentage = Decimal("0.00")
+            growth_percentage = 0.0
     else:
-        growth_percentage = (
-            (current_revenue - previous_revenue) / previous_revenue
-        ) * 100
-
-    growth_percentage = growth_percentage.quantize(Decimal("0.01"))
+        growth_percentage = percentage(
+            current_revenue - previous_revenue, previous_revenue
+        )
 
     # ----------------------------
     # Average Order Value
     # ----------------------------
     if current_orders == 0:
-        average_order_value = Decimal("0.00")
+        average_order_value = 0.0
     else:
-        average_order_value = (current_revenue / current_orders).quantize(
-            Decimal("0.01")
+        average_order_value = to_naira(
+            divide_half_even(current_revenue, current_orders)
         )
 
     # ----------------------------
     # Product Movement Analysis
     # ----------------------------
-    start_dt = datetime.combine(current_start, datetime.min.time())
-    end_dt = datetime.combine(current_end, datetime.max.time())
+    start_dt, end_dt = day_range(current_start, current_end)
 
     product_sales = (
-        db.query(
-            Product.name,
-            func.coalesce(func.sum(SaleItem.quantity), 0).label("quantity_sold"),
-            func.coalesce(
-                func.sum(
-                    (Product.selling_price - Product.cost_price) * SaleItem.quantity
-                ),
-                0
+        select(
+            Product.name.label("name"),
+            func.sum(SaleItem.quantity).label("quantity_sold"),
+            func.sum(
+                SaleItem.line_total - SaleItem.cost_price * SaleItem.quantity
             ).label("profit"),
-   )
-   .join(SaleItem, SaleItem.product_id == Product.id)
-   .join(Sale, SaleItem.sale_id == Sale.id)
-   .filter(
-       Sale.business_id == current_user.business_id,
-       Sale.created_at.between(start_dt, end_dt),
-   )
-   .group_by(Product.id, Product.name)
-   .all()
-)
-
-    top_selling_product = None
-    slowest_product = None
-
-    if product_sales:
-        sorted_products = sorted(product_sales, key=lambda x: x.profit, reverse=True)
-
-        top_selling_product = sorted_products[0].name
-        slowest_product = sorted_products[-1].name
+        )
+        .join(SaleItem, SaleItem.product_id == Product.id)
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .where(
+            Sale.business_id == business_id,
+            Sale.created_at >= start_dt,
+            Sale.created_at < end_dt,
+        )
+        .group_by(Product.id, Product.name)
+        .cte("product_sales")
+    )
+
+    inventory_total = (
+        select(func.coalesce(func.sum(Inventory.quantity_available), 0))
+        .where(Inventory.business_id == business_id)
+        .scalar_subquery()
+    )
+
+    # Ranked and totalled in the database; only one row comes back
+    product_movement = db.execute(
+        select(
+            select(product_sales.c.name)
+            .order_by(product_sales.c.profit.desc())
+            .limit(1)
+            .scalar_subquery()
+            .label("top_selling_product"),
+            select(product_sales.c.name)
+            .order_by(product_sales.c.profit.asc())
+            .limit(1)
+            .scalar_subquery()
+            .label("slowest_product"),
+            select(func.coalesce(func.sum(product_sales.c.quantity_sold), 0))
+            .scalar_subquery()
+            .label("total_items_sold"),
+            inventory_total.label("total_inventory_items"),
+        )
+    ).one()
+
+    top_selling_product = product_movement.top_selling_product
+    slowest_product = product_movement.slowest_product
 
     # ----------------------------
     # Inventory Turnover Proxy
     # ----------------------------
-    total_items_sold = sum(p.quantity_sold for p in product_sales) if product_sales else 0
-
-    total_inventory_items = (
-        db.query(func.coalesce(func.sum(Inventory.quantity_available), 0))
-        .join(Product, Product.id == Inventory.product_id)
-        .filter(Product.business_id == current_user.business_id)
-        .scalar()
-    )
+    total_items_sold = product_movement.total_items_sold
+    total_inventory_items = product_movement.total_inventory_items
 
     if not total_inventory_items:
-        inventory_turnover_rate = Decimal("0.00")
+        inventory_turnover_rate = 0.0
     else:
-        inventory_turnover_rate = (
-            Decimal(total_items_sold) / Decimal(total_inventory_items)
-        ).quantize(Decimal("0.01"))
+        # Quantities are NUMERIC(14, 4): scale to exact ints before dividing
+        inventory_turnover_rate = ratio(
+            int(total_items_sold * 10000),
+            int(total_inventory_items * 10000),
+        )
 
     return {
         "period": period,
-        "current_revenue": current_revenue,
-        "previous_revenue": previous_revenue,
+        "current_revenue": to_naira(current_revenue),
+        "previous_revenue": to_naira(previous_revenue),
         "growth_percentage": growth_percentage,
         "average_order_value": average_order_value,
         "top_selling_product": top_selling_product,
         "slowest_product": slowest_product,
         "inventory_turnover_rate": inventory_turnover_rate,
-    }
\ No newline at end of file
+    }
+
+
+# =========================================================
+# MAIN INSIGHTS ENDPOINT
+# =========================================================
+@router.get("/summary", dependencies=[Depends(report_etag)])
+async def insights_summary(
+    period: str = Query(..., pattern="^(weekly|monthly)$"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+
+    #  Require matching subscription
+    subscription = await require_subscription_async(
+        db,
+        current_user.business_id,
+        period,
+    )
+
+    if not subscription:
+        raise HTTPException(
+            status_code=402,
+            detail="Upgrade to unlock Business Insights",
+        )
+
+    today = datetime.now(timezone.utc).date()
+
+    return await cached_report_async(
+        (current_user.business_id, "insights", period, today),
+        lambda: _build_insights(db, current_user.business_id, period),
+    )
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models.users import User
 from app.core.config import settings
+from app.core.auth import invalidate_cached_user
 
 router = APIRouter(prefix="/internal", tags=["Internal"])
 
@@ -17,12 +19,18 @@ def promote_admin(
     if secret != settings.INTERNAL_ADMIN_SECRET:
         raise HTTPException(status_code=403, detail="Unauthorized")
 
-    user = db.query(User).filter(User.email == email).first()
+    user_id = db.execute(
+        update(User)
+        .where(User.email == email)
+        .values(is_admin=True)
+        .returning(User.id)
+    ).scalar_one_or_none()
 
-    if not user:
+    if user_id is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.is_admin = True
     db.commit()
 
+    invalidate_cached_user(user_id)
+
     return {"message": f"{email} promoted to admin"}
\ No newline at end of file
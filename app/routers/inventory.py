@@ -1,10 +1,11 @@
 # app/routers/inventory.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, contains_eager, joinedload, raiseload
 
 from app.database import get_db
 from app.core.auth import get_current_user
+from app.core.report_cache import bump_data_version
 from app.models.inventory import Inventory
 from app.models.products import Product
 from app.schemas.inventory import (
@@ -55,19 +56,24 @@ def add_inventory(
 
     inventory = Inventory(
         product_id=product.id,
+        business_id=product.business_id,
         quantity_available=inventory_data.quantity_available,
         low_stock_threshold=inventory_data.low_stock_threshold,
         expiry_date=inventory_data.expiry_date,
     )
 
+    # Read before commit expires it; saves reloading the product afterwards
+    product_name = product.name
+
     db.add(inventory)
+    bump_data_version(db, current_user.business_id)
     db.commit()
     db.refresh(inventory)
 
     return {
         "id": inventory.id,
         "product_id": inventory.product_id,
-        "product_name": inventory.product.name,
+        "product_name": product_name,
         "quantity_available": inventory.quantity_available,
         "low_stock_threshold": inventory.low_stock_threshold,
         "expiry_date": inventory.expiry_date,
@@ -83,10 +89,11 @@ def update_inventory(
 ):
     inventory = (
         db.query(Inventory)
-        .join(Product)
+        # The response needs the product name; load it with the row
+        .options(joinedload(Inventory.product).load_only(Product.name))
         .filter(
             Inventory.product_id == product_id,
-            Product.business_id == current_user.business_id,
+            Inventory.business_id == current_user.business_id,
         )
         .first()
     )
@@ -113,13 +120,16 @@ def update_inventory(
     if inventory_data.expiry_date is not None:
         inventory.expiry_date = inventory_data.expiry_date
 
+    product_name = inventory.product.name
+
+    bump_data_version(db, current_user.business_id)
     db.commit()
     db.refresh(inventory)
 
     return {
         "id": inventory.id,
         "product_id": inventory.product_id,
-        "product_name": inventory.product.name,
+        "product_name": product_name,
         "quantity_available": inventory.quantity_available,
         "low_stock_threshold": inventory.low_stock_threshold,
         "expiry_date": inventory.expiry_date,
@@ -133,9 +143,11 @@ def list_inventory(
 ):
     inventory_items = (
         db.query(Inventory)
-        .options(joinedload(Inventory.product))
+        # Join only for the product name; filtering stays on inventory
         .join(Product)
-        .filter(Product.business_id == current_user.business_id)
+        # Populate .product from the join above instead of joining twice
+        .options(contains_eager(Inventory.product), raiseload("*"))
+        .filter(Inventory.business_id == current_user.business_id)
         .all()
     )
 
@@ -8,8 +8,9 @@
 # =========================================================
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-import requests
+import httpx
 import logging
 from datetime import datetime, timezone
 from typing import Literal
@@ -18,6 +19,7 @@ from app.database import get_db
 from app.core.auth import get_current_user
 from app.models.export_access import ExportAccess
 from app.core.config import settings
+from app.core.subscription import PERIOD_PLANS
 
 
 router = APIRouter(prefix="/payments", tags=["Payments"])
@@ -32,28 +34,59 @@ if not settings.PAYSTACK_SECRET_KEY:
 
 PAYSTACK_SECRET_KEY = settings.PAYSTACK_SECRET_KEY
 
+# Shared client so the TLS connection to Paystack is kept alive between
+# initializations. Transport retries cover connection failures only.
+_paystack_client = httpx.AsyncClient(
+    timeout=10.0,
+    transport=httpx.AsyncHTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+    ),
+    headers={
+        "Authorization": f"Bearer {PAYSTACK_SECRET_KEY}",
+        "Content-Type": "application/json",
+    },
+)
+
+
+async def close_paystack_client():
+    await _paystack_client.aclose()
+
+
+def _has_active_access(db: Session, business_id: int, period_type: str, today):
+    return (
+        db.query(ExportAccess.id)
+        .filter(
+            ExportAccess.business_id == business_id,
+            ExportAccess.period_type == period_type,
+            ExportAccess.end_date >= today,
+        )
+        .first()
+        is not None
+    )
+
 
 @router.post("/initialize")
-def initialize_payment(
+async def initialize_payment(
     period_type: Literal["weekly", "monthly"],
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     #  Validate period type
-    if period_type not in {"weekly", "monthly"}:
+    plan = PERIOD_PLANS.get(period_type)
+    if plan is None:
         raise HTTPException(status_code=400, detail="Invalid period type")
 
     today = datetime.now(timezone.utc).date()
 
     #  Prevent duplicate active subscription for same period
-    existing_access = (
-        db.query(ExportAccess)
-        .filter(
-            ExportAccess.business_id == current_user.business_id,
-            ExportAccess.period_type == period_type,
-            ExportAccess.end_date >= today,
-        )
-        .first()
+    # Async endpoint: the blocking DB check runs in the threadpool
+    existing_access = await run_in_threadpool(
+        _has_active_access,
+        db,
+        current_user.business_id,
+        period_type,
+        today,
     )
 
     if existing_access:
@@ -63,7 +96,7 @@ def initialize_payment(
         )
 
     #  Server-controlled pricing (in kobo)
-    amount_kobo = 50000 if period_type == "weekly" else 150000
+    amount_kobo, _ = plan
 
     payload = {
         "email": current_user.email,
@@ -74,20 +107,10 @@ def initialize_payment(
         },
     }
 
-    headers = {
-        "Authorization": f"Bearer {PAYSTACK_SECRET_KEY}",
-        "Content-Type": "application/json",
-    }
-
     #  Call Paystack
     try:
-        response = requests.post(
-            PAYSTACK_INIT_URL,
-            json=payload,
-            headers=headers,
-            timeout=10,
-        )
-    except requests.RequestException as e:
+        response = await _paystack_client.post(PAYSTACK_INIT_URL, json=payload)
+    except httpx.HTTPError as e:
         logger.error(f"Paystack connection error: {str(e)}")
         raise HTTPException(
             status_code=500,
@@ -1,12 +1,14 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta, timezone
+from sqlalchemy import Date, case, cast, func, literal
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
 from app.database import get_db
 from app.core.auth import get_current_user
-from app.core.subscription import require_subscription
+from app.core.subscription import require_subscription_async
+from app.core.report_cache import cached_report_async, report_etag
+from app.utils.dates import day_range
 from app.models.sales import Sale
 from app.models.sale_items import SaleItem
 from app.models.products import Product
@@ -15,115 +17,300 @@ from app.models.inventory import Inventory
 router = APIRouter(prefix="/premium", tags=["Premium Intelligence"])
 
 
-@router.get("/profit-ranking")
-def profit_ranking(
-    period: str = Query(..., pattern="^(weekly|monthly)$"),
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
-):
+def _build_profit_ranking(db: Session, business_id: int, period: str, today: date):
 
-    #  Require matching subscription
-    subscription = require_subscription(
-        db,
-        current_user.business_id,
-        period,
+    if period == "weekly":
+        start_date = today - timedelta(days=6)
+    else:
+        start_date = today - timedelta(days=29)
+
+    start_dt, end_dt = day_range(start_date, today)
+
+    revenue = func.sum(SaleItem.line_total)
+    cost = func.sum(SaleItem.cost_price * SaleItem.quantity)
+
+    product_profit = (
+        db.query(
+            Product.id.label("product_id"),
+            Product.name.label("product_name"),
+            revenue.label("revenue"),
+            cost.label("cost"),
+            (revenue - cost).label("profit"),
+        )
+        .join(SaleItem, SaleItem.product_id == Product.id)
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .filter(
+            Sale.business_id == business_id,
+            Sale.created_at >= start_dt,
+            Sale.created_at < end_dt,
+        )
+        .group_by(Product.id, Product.name)
+        .cte("product_profit")
     )
 
-    if not subscription:
-        raise HTTPException(
-            status_code=402,
-            detail="Upgrade to unlock Profit Intelligence Engine",
+    profit = product_profit.c.profit
+    total_profit = func.sum(profit).over()
+
+    # Margin, contribution and both rankings are computed per row by the
+    # database; only the top and bottom five rows come back
+    ranked = (
+        db.query(
+            product_profit,
+            func.coalesce(
+                func.round(profit / func.nullif(product_profit.c.revenue, 0) * 100, 2),
+                0,
+            ).label("profit_margin_percentage"),
+            func.coalesce(
+                func.round(profit / func.nullif(total_profit, 0) * 100, 2),
+                0,
+            ).label("profit_contribution_percentage"),
+            total_profit.label("total_profit"),
+            func.row_number()
+            .over(order_by=(profit.desc(), product_profit.c.product_id))
+            .label("rank_desc"),
+            func.row_number()
+            .over(order_by=(profit.asc(), product_profit.c.product_id))
+            .label("rank_asc"),
         )
+        .subquery()
+    )
 
-    today = datetime.now(timezone.utc).date()
+    rows = (
+        db.query(ranked)
+        .filter((ranked.c.rank_desc <= 5) | (ranked.c.rank_asc <= 5))
+        .all()
+    )
+
+    def _as_item(row):
+        return {
+            "product_id": row.product_id,
+            "product_name": row.product_name,
+            "revenue": row.revenue,
+            "cost": row.cost,
+            "profit": row.profit,
+            "profit_margin_percentage": row.profit_margin_percentage,
+            "profit_contribution_percentage": row.profit_contribution_percentage,
+        }
+
+    top_5 = sorted((row for row in rows if row.rank_desc <= 5), key=lambda row: row.rank_desc)
+    bottom_5 = sorted((row for row in rows if row.rank_asc <= 5), key=lambda row: row.rank_asc)
+
+    return {
+        "period": period,
+        "total_business_profit": rows[0].total_profit if rows else Decimal("0.00"),
+        "top_5_products": [_as_item(row) for row in top_5],
+        "bottom_5_products": [_as_item(row) for row in bottom_5],
+    }
+
+
+def _build_stock_prediction(db: Session, business_id: int, period: str, today: date):
 
     if period == "weekly":
+        days_range = 7
         start_date = today - timedelta(days=6)
     else:
+        days_range = 30
         start_date = today - timedelta(days=29)
 
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(today, datetime.max.time())
+    start_dt, end_dt = day_range(start_date, today)
 
-    results = (
+    # Quantity sold per product in the window, aggregated once
+    sold_per_product = (
         db.query(
-            Product.id,
-            Product.name,
-            func.coalesce(func.sum(SaleItem.line_total), 0).label("revenue"),
-            func.coalesce(func.sum(Product.cost_price * SaleItem.quantity), 0).label("cost"),
+            SaleItem.product_id.label("product_id"),
+            func.sum(SaleItem.quantity).label("total_sold"),
         )
-        .join(SaleItem, SaleItem.product_id == Product.id)
         .join(Sale, SaleItem.sale_id == Sale.id)
         .filter(
-            Sale.business_id == current_user.business_id,
-            Sale.created_at.between(start_dt, end_dt),
+            Sale.business_id == business_id,
+            Sale.created_at >= start_dt,
+            Sale.created_at < end_dt,
         )
-        .group_by(Product.id, Product.name)
+        .group_by(SaleItem.product_id)
+        .subquery()
+    )
+
+    daily_avg = func.round(
+        func.coalesce(sold_per_product.c.total_sold, 0) / days_range, 2
+    )
+
+    stock_rows = (
+        db.query(
+            Inventory.product_id,
+            Inventory.quantity_available,
+            Product.name,
+            Product.base_unit,
+            daily_avg.label("daily_avg"),
+            # NULL when nothing sold (daily average rounds to 0)
+            func.round(
+                Inventory.quantity_available / func.nullif(daily_avg, 0), 2
+            ).label("days_remaining"),
+        )
+        .join(Product, Product.id == Inventory.product_id)
+        .outerjoin(
+            sold_per_product,
+            sold_per_product.c.product_id == Inventory.product_id,
+        )
+        .filter(Inventory.business_id == business_id)
         .all()
     )
 
-    formatted = []
+    results = []
 
-    total_profit_all = Decimal("0.00")
+    for inv in stock_rows:
 
-    # First pass -- calculate profit per product
-    for row in results:
-        revenue = Decimal(row.revenue or 0)
-        cost = Decimal(row.cost or 0)
-        profit = revenue - cost
+        days_remaining = inv.days_remaining
 
-        total_profit_all += profit
+        if days_remaining is None:
+            status_label = "idle"
+        elif days_remaining <= 3:
+            status_label = "critical"
+        elif days_remaining <= 7:
+            status_label = "warning"
+        else:
+            status_label = "healthy"
 
-        formatted.append({
-            "product_id": row.id,
-            "product_name": row.name,
-            "revenue": revenue,
-            "cost": cost,
-            "profit": profit,
+        results.append({
+            "product_id": inv.product_id,
+            "product_name": inv.name,
+            "current_stock": inv.quantity_available,
+            "base_unit": inv.base_unit,
+            "average_daily_sales": inv.daily_avg,
+            "estimated_days_remaining": days_remaining,
+            "stock_status": status_label,
         })
 
-    # Second pass -- calculate margin & contribution
-    for item in formatted:
+    # Sort by urgency (critical first)
+    priority_order = {"critical": 0, "warning": 1, "healthy": 2, "idle": 3}
+    results.sort(key=lambda x: priority_order[x["stock_status"]])
 
-        revenue = item["revenue"]
-        profit = item["profit"]
+    return {
+        "period": period,
+        "results": results
+    }
 
-        if revenue == 0:
-            margin = Decimal("0.00")
-        else:
-            margin = ((profit / revenue) * 100).quantize(Decimal("0.01"))
 
-        if total_profit_all == 0:
-            contribution = Decimal("0.00")
-        else:
-            contribution = ((profit / total_profit_all) * 100).quantize(Decimal("0.01"))
+def _build_risk_monitor(
+    db: Session,
+    business_id: int,
+    days_without_sales: int,
+    expiry_alert_days: int,
+    today: date,
+):
 
-        item["profit_margin_percentage"] = margin
-        item["profit_contribution_percentage"] = contribution
+    # Last sale per product, aggregated once
+    last_sale_per_product = (
+        db.query(
+            SaleItem.product_id.label("product_id"),
+            func.max(Sale.created_at).label("last_sale"),
+        )
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .filter(Sale.business_id == business_id)
+        .group_by(SaleItem.product_id)
+        .subquery()
+    )
 
-    # Sort descending for top
-    sorted_desc = sorted(formatted, key=lambda x: x["profit"], reverse=True)
+    last_sale = last_sale_per_product.c.last_sale
+    today_value = literal(today, Date)
 
-    # Sort ascending for bottom
-    sorted_asc = sorted(formatted, key=lambda x: x["profit"])
+    # Day counts are date - date (an integer) in the database
+    days_since_sale = today_value - cast(last_sale, Date)
+    days_to_expiry = Inventory.expiry_date - today_value
 
-    return {
-        "period": period,
-        "total_business_profit": total_profit_all,
-        "top_5_products": sorted_desc[:5],
-        "bottom_5_products": sorted_asc[:5],
-    }
+    stock_rows = (
+        db.query(
+            Inventory.quantity_available,
+            Inventory.expiry_date,
+            Product.id,
+            Product.name,
+            Product.base_unit,
+            days_since_sale.label("days_since_sale"),
+            days_to_expiry.label("days_to_expiry"),
+            case(
+                (last_sale.is_(None), "never_sold"),
+                (days_since_sale > days_without_sales, "dead"),
+                (days_since_sale > days_without_sales // 2, "slow"),
+            ).label("sales_bucket"),
+            # NULL expiry_date never matches
+            Inventory.expiry_date.between(
+                today, today + timedelta(days=expiry_alert_days)
+            ).label("expiring"),
+            (Inventory.quantity_available * Product.cost_price).label("capital_locked"),
+            func.round(func.sum(Inventory.quantity_available * Product.cost_price).over(), 2).label("total_capital_locked"),
+        )
+        .join(Product, Product.id == Inventory.product_id)
+        .outerjoin(
+            last_sale_per_product,
+            last_sale_per_product.c.product_id == Inventory.product_id,
+        )
+        .filter(Inventory.business_id == business_id)
+        .all()
+    )
 
+    dead_stock = []
+    slow_moving = []
+    expiring_soon = []
 
+    for inv in stock_rows:
 
-@router.get("/stock-prediction")
-def stock_prediction(
+        bucket = inv.sales_bucket
+
+        if bucket == "never_sold":
+            dead_stock.append({
+                "product_id": inv.id,
+                "product_name": inv.name,
+                "current_stock": inv.quantity_available,
+                "base_unit": inv.base_unit,
+                "capital_locked": inv.capital_locked,
+                "reason": "Never sold",
+            })
+        elif bucket == "dead":
+            dead_stock.append({
+                "product_id": inv.id,
+                "product_name": inv.name,
+                "current_stock": inv.quantity_available,
+                "base_unit": inv.base_unit,
+                "capital_locked": inv.capital_locked,
+                "days_since_last_sale": inv.days_since_sale,
+            })
+        elif bucket == "slow":
+            slow_moving.append({
+                "product_id": inv.id,
+                "product_name": inv.name,
+                "current_stock": inv.quantity_available,
+                "base_unit": inv.base_unit,
+                "days_since_last_sale": inv.days_since_sale,
+            })
+
+        if inv.expiring:
+            expiring_soon.append({
+                "product_id": inv.id,
+                "product_name": inv.name,
+                "expiry_date": inv.expiry_date,
+                "days_to_expiry": inv.days_to_expiry,
+                "current_stock": inv.quantity_available,
+                "base_unit": inv.base_unit,
+            })
+
+    return {
+        "dead_stock": dead_stock,
+        "slow_moving": slow_moving,
+        "expiring_soon": expiring_soon,
+        "total_capital_locked": (
+            stock_rows[0].total_capital_locked if stock_rows else Decimal("0.00")
+        ),
+    }  
+
+
+@router.get("/profit-ranking", dependencies=[Depends(report_etag)])
+async def profit_ranking(
     period: str = Query(..., pattern="^(weekly|monthly)$"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
 
-    subscription = require_subscription(
+    #  Require matching subscription
+    subscription = await require_subscription_async(
         db,
         current_user.business_id,
         period,
@@ -132,90 +319,46 @@ def stock_prediction(
     if not subscription:
         raise HTTPException(
             status_code=402,
-            detail="Upgrade to unlock Smart Stock Prediction",
+            detail="Upgrade to unlock Profit Intelligence Engine",
         )
 
     today = datetime.now(timezone.utc).date()
 
-    if period == "weekly":
-        days_range = 7
-        start_date = today - timedelta(days=6)
-    else:
-        days_range = 30
-        start_date = today - timedelta(days=29)
+    return await cached_report_async(
+        (current_user.business_id, "profit_ranking", period, today),
+        lambda: _build_profit_ranking(db, current_user.business_id, period, today),
+    )
 
-    start_dt = datetime.combine(start_date, datetime.min.time())
-    end_dt = datetime.combine(today, datetime.max.time())
 
-    results = []
+@router.get("/stock-prediction", dependencies=[Depends(report_etag)])
+async def stock_prediction(
+    period: str = Query(..., pattern="^(weekly|monthly)$"),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_user),
+):
 
-    inventories = (
-        db.query(Inventory)
-        .join(Product)
-        .filter(Product.business_id == current_user.business_id)
-        .all()
+    subscription = await require_subscription_async(
+        db,
+        current_user.business_id,
+        period,
     )
 
-    for inv in inventories:
-
-        total_sold = (
-            db.query(func.coalesce(func.sum(SaleItem.quantity), 0))
-            .join(Sale, SaleItem.sale_id == Sale.id)
-            .filter(
-                Sale.business_id == current_user.business_id,
-                SaleItem.product_id == inv.product_id,
-                Sale.created_at.between(start_dt, end_dt),
-            )
-            .scalar()
+    if not subscription:
+        raise HTTPException(
+            status_code=402,
+            detail="Upgrade to unlock Smart Stock Prediction",
         )
 
-        total_sold = Decimal(total_sold or 0)
-
-        if total_sold == 0:
-            daily_avg = Decimal("0.00")
-            days_remaining = None
-            status_label = "idle"
-
-        else:
-            daily_avg = (total_sold / Decimal(days_range)).quantize(Decimal("0.01"))
-
-            if daily_avg == 0:
-                days_remaining = None
-                status_label = "idle"
-            else:
-                days_remaining = (
-                    Decimal(inv.quantity_available) / daily_avg
-                ).quantize(Decimal("0.01"))
-
-                if days_remaining <= 3:
-                    status_label = "critical"
-                elif days_remaining <= 7:
-                    status_label = "warning"
-                else:
-                    status_label = "healthy"
-
-        results.append({
-            "product_id": inv.product_id,
-            "product_name": inv.product.name,
-            "current_stock": inv.quantity_available,
-            "base_unit": inv.product.base_unit,
-            "average_daily_sales": daily_avg,
-            "estimated_days_remaining": days_remaining,
-            "stock_status": status_label,
-        })
-
-    # Sort by urgency (critical first)
-    priority_order = {"critical": 0, "warning": 1, "healthy": 2, "idle": 3}
-    results.sort(key=lambda x: priority_order[x["stock_status"]])
+    today = datetime.now(timezone.utc).date()
 
-    return {
-        "period": period,
-        "results": results
-    }
+    return await cached_report_async(
+        (current_user.business_id, "stock_prediction", period, today),
+        lambda: _build_stock_prediction(db, current_user.business_id, period, today),
+    )
 
 
-@router.get("/risk-monitor")
-def risk_monitor(
+@router.get("/risk-monitor", dependencies=[Depends(report_etag)])
+async def risk_monitor(
     days_without_sales: int = Query(30, ge=1),
     expiry_alert_days: int = Query(7, ge=1),
     db: Session = Depends(get_db),
@@ -230,15 +373,13 @@ def risk_monitor(
     - Total capital locked in inventory
     """
 
-    # Allow either weekly or monthly subscription
-    weekly_sub = require_subscription(
+    # Allow either weekly or monthly subscription: the weekly check
+    # already matches both plans in a single query
+    subscription = await require_subscription_async(
         db, current_user.business_id, "weekly"
     )
-    monthly_sub = require_subscription(
-        db, current_user.business_id, "monthly"
-    )
 
-    if not weekly_sub and not monthly_sub:
+    if not subscription:
         raise HTTPException(
             status_code=402,
             detail="Upgrade to unlock Risk Monitor",
@@ -246,97 +387,19 @@ def risk_monitor(
 
     today = datetime.now(timezone.utc).date()
 
-    inventories = (
-        db.query(Inventory)
-        .join(Product)
-        .filter(Product.business_id == current_user.business_id)
-        .all()
+    return await cached_report_async(
+        (
+            current_user.business_id,
+            "risk_monitor",
+            days_without_sales,
+            expiry_alert_days,
+            today,
+        ),
+        lambda: _build_risk_monitor(
+            db,
+            current_user.business_id,
+            days_without_sales,
+            expiry_alert_days,
+            today,
+        ),
     )
-
-    dead_stock = []
-    slow_moving = []
-    expiring_soon = []
-
-    total_capital_locked = Decimal("0.00")
-
-    for inv in inventories:
-
-        product = inv.product
-
-        # -------------------------
-        # CAPITAL LOCKED
-        # -------------------------
-        capital_locked = (
-            Decimal(inv.quantity_available) * Decimal(product.cost_price)
-        )
-        total_capital_locked += capital_locked
-
-        # -------------------------
-        # LAST SOLD DATE
-        # -------------------------
-        last_sale = (
-            db.query(func.max(Sale.created_at))
-            .join(SaleItem, SaleItem.sale_id == Sale.id)
-            .filter(
-                Sale.business_id == current_user.business_id,
-                SaleItem.product_id == product.id,
-            )
-            .scalar()
-        )
-
-        # -------------------------
-        # DEAD STOCK CHECK
-        # -------------------------
-        if not last_sale:
-            # Never sold
-            dead_stock.append({
-                "product_id": product.id,
-                "product_name": product.name,
-                "current_stock": inv.quantity_available,
-                "base_unit": product.base_unit,
-                "capital_locked": capital_locked,
-                "reason": "Never sold",
-            })
-        else:
-            days_since_sale = (today - last_sale.date()).days
-
-            if days_since_sale > days_without_sales:
-                dead_stock.append({
-                    "product_id": product.id,
-                    "product_name": product.name,
-                    "current_stock": inv.quantity_available,
-                    "base_unit": product.base_unit,
-                    "capital_locked": capital_locked,
-                    "days_since_last_sale": days_since_sale,
-                })
-            elif days_since_sale > (days_without_sales // 2):
-                slow_moving.append({
-                    "product_id": product.id,
-                    "product_name": product.name,
-                    "current_stock": inv.quantity_available,
-                    "base_unit": product.base_unit,
-                    "days_since_last_sale": days_since_sale,
-                })
-
-        # -------------------------
-        # EXPIRY CHECK
-        # -------------------------
-        if inv.expiry_date:
-            days_to_expiry = (inv.expiry_date - today).days
-
-            if 0 <= days_to_expiry <= expiry_alert_days:
-                expiring_soon.append({
-                    "product_id": product.id,
-                    "product_name": product.name,
-                    "expiry_date": inv.expiry_date,
-                    "days_to_expiry": days_to_expiry,
-                    "current_stock": inv.quantity_available,
-                    "base_unit": product.base_unit,
-                })
-
-    return {
-        "dead_stock": dead_stock,
-        "slow_moving": slow_moving,
-        "expiring_soon": expiring_soon,
-        "total_capital_locked": total_capital_locked.quantize(Decimal("0.01")),
-    }  
\ No newline at end of file
@@ -1,18 +1,24 @@
 # app/routers/products.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import exists, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.core import subscription
 from app.database import get_db
 from app.core.auth import get_current_user
 from app.core.subscription import get_active_subscription
+from app.core.report_cache import bump_data_version
 from app.models.products import Product
 from app.models.sale_items import SaleItem
 from app.schemas.product import (
     ProductCreate,
     ProductUpdate,
     ProductResponse,
+    ProductListResponse,
 )
 
 router = APIRouter(
@@ -34,22 +40,6 @@ def create_product(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    # Prevent duplicate product names per business
-    existing_product = (
-        db.query(Product)
-        .filter(
-            Product.name == product_data.name,
-            Product.business_id == current_user.business_id,
-        )
-        .first()
-    )
-
-    if existing_product:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Product with this name already exists",
-        )
-
     # Business rule: selling price must not be lower than cost price
     if product_data.selling_price < product_data.cost_price:
         raise HTTPException(
@@ -70,9 +60,9 @@ def create_product(
 
     subscription = get_active_subscription(db, current_user.business_id)
 
-    product_count = db.query(Product).filter(
+    product_count = db.query(func.count(Product.id)).filter(
         Product.business_id == current_user.business_id
-    ).count()
+    ).scalar()
 
     if not subscription:
         if product_count >= 10:
@@ -88,17 +78,29 @@ def create_product(
                 detail="Weekly plan allows only 30 products. Upgrade to monthly."
             )
 
-    product = Product(
-        name=product_data.name,
-        base_unit=product_data.base_unit.strip(),
-        cost_price=product_data.cost_price,
-        selling_price=product_data.selling_price,
-        business_id=current_user.business_id,
-    )
+    # Duplicate names per business are rejected by uq_business_product_name:
+    # one atomic round trip instead of a SELECT followed by an INSERT
+    product = db.scalars(
+        insert(Product)
+        .values(
+            name=product_data.name,
+            base_unit=product_data.base_unit.strip(),
+            cost_price=product_data.cost_price,
+            selling_price=product_data.selling_price,
+            business_id=current_user.business_id,
+        )
+        .on_conflict_do_nothing(constraint="uq_business_product_name")
+        .returning(Product)
+    ).first()
+
+    if product is None:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Product with this name already exists",
+        )
 
-    db.add(product)
     db.commit()
-    db.refresh(product)
 
     return product
 
@@ -106,19 +108,32 @@ def create_product(
 # =========================================================
 # LIST PRODUCTS
 # =========================================================
-@router.get("", response_model=list[ProductResponse])
+@router.get("", response_model=ProductListResponse)
 def list_products(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    after: Optional[int] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
 ):
-    products = (
-        db.query(Product)
-        .filter(Product.business_id == current_user.business_id)
-        .order_by(Product.id.desc())
-        .all()
-    )
+    # Keyset pagination, newest first: `after` is the last id of the
+    # previous page. One extra row is fetched to tell whether a next
+    # page exists.
+    query = db.query(Product).filter(Product.business_id == current_user.business_id)
 
-    return products
+    if after is not None:
+        query = query.filter(Product.id < after)
+
+    products = query.order_by(Product.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = products[-1].id
+
+    return {
+        "items": products,
+        "next_cursor": next_cursor,
+    }
 
 
 # =========================================================
@@ -131,16 +146,10 @@ def update_product(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    product = (
-        db.query(Product)
-        .filter(
-            Product.id == product_id,
-            Product.business_id == current_user.business_id,
-        )
-        .first()
-    )
+    # Primary key lookup (served from the identity map when already loaded)
+    product = db.get(Product, product_id)
 
-    if not product:
+    if not product or product.business_id != current_user.business_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
@@ -194,6 +203,7 @@ def update_product(
     if product_data.selling_price is not None:
         product.selling_price = product_data.selling_price
 
+    bump_data_version(db, current_user.business_id)
     db.commit()
     db.refresh(product)
 
@@ -209,27 +219,19 @@ def delete_product(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
-    product = (
-        db.query(Product)
-        .filter(
-            Product.id == product_id,
-            Product.business_id == current_user.business_id,
-        )
-        .first()
-    )
+    # Primary key lookup (served from the identity map when already loaded)
+    product = db.get(Product, product_id)
 
-    if not product:
+    if not product or product.business_id != current_user.business_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found",
         )
 
     # Prevent deleting products that already have sales
-    has_sales = (
-        db.query(SaleItem)
-        .filter(SaleItem.product_id == product_id)
-        .first()
-    )
+    has_sales = db.query(
+        exists().where(SaleItem.product_id == product_id)
+    ).scalar()
 
     if has_sales:
         raise HTTPException(
@@ -238,6 +240,7 @@ def delete_product(
         )
 
     db.delete(product)
+    bump_data_version(db, current_user.business_id)
     db.commit()
 
     return None
@@ -15,10 +15,11 @@
 # Schema-safe: Always returns Decimal (never None)
 # =========================================================
 
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date, timedelta, datetime, timezone
+from sqlalchemy import BigInteger, Numeric, bindparam, cast, func, select, true
+from datetime import date, timedelta, datetime
 from decimal import Decimal
 from typing import Optional
 from calendar import monthrange
@@ -26,7 +27,13 @@ import pytz
 
 from app.database import get_db
 from app.core.auth import get_current_user
-from app.core.subscription import require_subscription, get_active_subscription
+from app.core.subscription import (
+    get_active_subscription,
+    get_active_subscription_async,
+    require_subscription_async,
+)
+from app.core.report_cache import cached_report, cached_report_async, report_etag
+from app.utils.dates import lagos_day_range_utc
 from app.models.sales import Sale
 from app.models.sale_items import SaleItem
 from app.models.products import Product
@@ -40,84 +47,161 @@ from app.schemas.report import (
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
-# Add this function after imports, before any @router
+# Product profit pages are cached as finished JSON bytes, serialized in
+# one pydantic-core call instead of re-validating every row per request
+_PRODUCT_PROFIT_ADAPTER = TypeAdapter(ProductProfitReportResponse)
+
 def get_nigerian_date():
     tz = pytz.timezone('Africa/Lagos')
     return datetime.now(tz).date()
 
+def _amount(expr):
+    # Money comes back from the database already at NUMERIC(18, 2)
+    return cast(func.coalesce(expr, 0), Numeric(18, 2))
+
+
+def _kobo(amount):
+    # Exact: amount is already NUMERIC(18, 2)
+    return cast(amount * 100, BigInteger)
+
+
 # =========================================================
 # CORE SALES SUMMARY CALCULATION
 # =========================================================
+
+# Report statements are built once; only the bound values change between calls
+_REPORT_FILTER = (
+    Sale.business_id == bindparam("business_id"),
+    Sale.created_at >= bindparam("start_dt"),
+    Sale.created_at < bindparam("end_dt"),
+)
+
+_sale_totals = (
+    select(
+        _amount(func.sum(Sale.total_amount)).label("total_sales"),
+        func.count(Sale.id).label("total_orders"),
+    )
+    .where(*_REPORT_FILTER)
+    .subquery("sale_totals")
+)
+
+_items_sold = (
+    select(func.coalesce(func.sum(SaleItem.quantity), 0))
+    .select_from(SaleItem)
+    .join(Sale, SaleItem.sale_id == Sale.id)
+    .where(*_REPORT_FILTER)
+    .scalar_subquery()
+)
+
+_item_totals = (
+    select(
+        func.coalesce(func.sum(SaleItem.quantity), 0).label("total_items_sold"),
+        _amount(func.sum(SaleItem.cost_price * SaleItem.quantity)).label("total_cost"),
+    )
+    .select_from(SaleItem)
+    .join(Sale, SaleItem.sale_id == Sale.id)
+    .where(*_REPORT_FILTER)
+    .subquery("item_totals")
+)
+
+_total_profit = _sale_totals.c.total_sales - _item_totals.c.total_cost
+
+# Revenue, order and item counts only (free plans)
+REVENUE_REPORT_STMT = select(
+    _sale_totals,
+    _kobo(_sale_totals.c.total_sales).label("total_sales_kobo"),
+    _items_sold.label("total_items_sold"),
+)
+
+# Sale and item aggregates are computed separately (so totals aren't
+# multiplied by item rows) and returned in one round-trip; profit and
+# margin are NUMERIC arithmetic on the same row
+REPORT_STMT = select(
+    _sale_totals,
+    _item_totals,
+    _total_profit.label("total_profit"),
+    _kobo(_sale_totals.c.total_sales).label("total_sales_kobo"),
+    _kobo(_item_totals.c.total_cost).label("total_cost_kobo"),
+    _kobo(_total_profit).label("total_profit_kobo"),
+    _amount(
+        func.round(
+            _total_profit / func.nullif(_sale_totals.c.total_sales, 0) * 100, 2
+        )
+    ).label("profit_margin_percentage"),
+).select_from(
+    _sale_totals.join(_item_totals, true())
+)
+
+
 def _calculate_report(
     db: Session,
     business_id: int,
     start_date: date,
     end_date: date,
+    include_cost: bool = True,
 ):
-    
-    nigeria_tz = pytz.timezone("Africa/Lagos")
-
-    # Convert start_date → Nigeria midnight
-    start_local = nigeria_tz.localize(datetime.combine(start_date, datetime.min.time()))
+    return cached_report(
+        (business_id, "report", start_date, end_date, include_cost),
+        lambda: _compute_report(db, business_id, start_date, end_date, include_cost),
+    )
 
-    # Convert end_date → Nigeria end of day
-    end_local = nigeria_tz.localize(datetime.combine(end_date, datetime.max.time()))
 
-    # Convert both to UTC (because DB stores UTC)
-    start_dt = start_local.astimezone(pytz.utc)
-    end_dt = end_local.astimezone(pytz.utc)
+async def _calculate_report_async(
+    db: Session,
+    business_id: int,
+    start_date: date,
+    end_date: date,
+    include_cost: bool = True,
+):
+    return await cached_report_async(
+        (business_id, "report", start_date, end_date, include_cost),
+        lambda: _compute_report(db, business_id, start_date, end_date, include_cost),
+    )
 
-    base_filter = [
-        Sale.business_id == business_id,
-        Sale.created_at.between(start_dt, end_dt),
-    ]
 
-    total_sales = (
-        db.query(func.coalesce(func.sum(Sale.total_amount), 0))
-        .filter(*base_filter)
-        .scalar()
-    )
+def _compute_report(
+    db: Session,
+    business_id: int,
+    start_date: date,
+    end_date: date,
+    include_cost: bool = True,
+):
 
-    total_orders = (
-        db.query(func.count(Sale.id))
-        .filter(*base_filter)
-        .scalar()
-    )
+    start_dt, end_dt = lagos_day_range_utc(start_date, end_date)
 
-    total_items_sold = (
-        db.query(func.coalesce(func.sum(SaleItem.quantity), 0))
-        .join(Sale, SaleItem.sale_id == Sale.id)
-        .filter(*base_filter)
-        .scalar()
-    )
+    params = {"business_id": business_id, "start_dt": start_dt, "end_dt": end_dt}
 
-    total_cost = (
-        db.query(func.coalesce(func.sum(Product.cost_price * SaleItem.quantity), 0))
-        .join(SaleItem, SaleItem.product_id == Product.id)
-        .join(Sale, SaleItem.sale_id == Sale.id)
-        .filter(*base_filter)
-        .scalar()
-    )
+    if not include_cost:
+        # Free plans never see cost/profit: skip the product join and
+        # the cost aggregate entirely
+        totals = db.execute(REVENUE_REPORT_STMT, params).one()
 
-    total_sales = Decimal(total_sales or 0)
-    total_cost = Decimal(total_cost or 0)
-    total_profit = total_sales - total_cost
+        return {
+            "total_sales": totals.total_sales,
+            "total_cost": Decimal("0.00"),
+            "total_profit": Decimal("0.00"),
+            "total_sales_kobo": totals.total_sales_kobo,
+            "total_cost_kobo": 0,
+            "total_profit_kobo": 0,
+            "profit_margin_percentage": Decimal("0.00"),
+            "total_orders": totals.total_orders,
+            "total_items_sold": totals.total_items_sold,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
 
-    #  PROFIT MARGIN %
-    if total_sales == 0:
-        profit_margin_percentage = Decimal("0.00")
-    else:
-        profit_margin_percentage = (
-            (total_profit / total_sales) * 100
-        ).quantize(Decimal("0.01"))
+    totals = db.execute(REPORT_STMT, params).one()
 
     return {
-        "total_sales": total_sales,
-        "total_cost": total_cost,
-        "total_profit": total_profit,
-        "profit_margin_percentage": profit_margin_percentage,
-        "total_orders": total_orders,
-        "total_items_sold": total_items_sold,
+        "total_sales": totals.total_sales,
+        "total_cost": totals.total_cost,
+        "total_profit": totals.total_profit,
+        "total_sales_kobo": totals.total_sales_kobo,
+        "total_cost_kobo": totals.total_cost_kobo,
+        "total_profit_kobo": totals.total_profit_kobo,
+        "profit_margin_percentage": totals.profit_margin_percentage,
+        "total_orders": totals.total_orders,
+        "total_items_sold": totals.total_items_sold,
         "start_date": start_date,
         "end_date": end_date,
     }
@@ -126,7 +210,7 @@ def _calculate_report(
 # =========================================================
 # CORE PRODUCT PROFIT CALCULATION
 # =========================================================
-def _calculate_product_profit(
+async def _calculate_product_profit(
     db: Session,
     business_id: int,
     start_date: date,
@@ -135,89 +219,138 @@ def _calculate_product_profit(
     limit: int,
     offset: int,
 ):
-    nigeria_tz = pytz.timezone("Africa/Lagos")
-
-    start_local = nigeria_tz.localize(datetime.combine(start_date, datetime.min.time()))
-    end_local = nigeria_tz.localize(datetime.combine(end_date, datetime.max.time()))
+    return await cached_report_async(
+        (business_id, "product_profit", start_date, end_date, search, limit, offset),
+        lambda: _compute_product_profit(
+            db, business_id, start_date, end_date, search, limit, offset
+        ),
+    )
 
-    start_dt = start_local.astimezone(pytz.utc)
-    end_dt = end_local.astimezone(pytz.utc)
 
-    base_query = (
-        db.query(
-            Product.id.label("product_id"),
-            Product.name.label("product_name"),
-            Product.base_unit.label("base_unit"),
-            func.coalesce(func.sum(SaleItem.quantity), 0).label("total_quantity_sold"),
-            func.coalesce(func.sum(SaleItem.line_total), 0).label("total_revenue"),
-            func.coalesce(
-                func.sum(Product.cost_price * SaleItem.quantity), 0
-            ).label("total_cost"),
+def _compute_product_profit(
+    db: Session,
+    business_id: int,
+    start_date: date,
+    end_date: date,
+    search: Optional[str],
+    limit: int,
+    offset: int,
+):
+    start_dt, end_dt = lagos_day_range_utc(start_date, end_date)
+
+    # Aggregated on sale_items.product_id alone so the covering sale_items
+    # index serves the GROUP BY; products is only joined for the page
+    per_product = (
+        select(
+            SaleItem.product_id.label("product_id"),
+            func.sum(SaleItem.quantity).label("quantity"),
+            func.sum(SaleItem.line_total).label("revenue"),
+            func.sum(SaleItem.cost_price * SaleItem.quantity).label("cost"),
         )
-        .join(SaleItem, SaleItem.product_id == Product.id)
         .join(Sale, SaleItem.sale_id == Sale.id)
-        .filter(
+        .where(
             Sale.business_id == business_id,
-            Sale.created_at.between(start_dt, end_dt),
+            Sale.created_at >= start_dt,
+            Sale.created_at < end_dt,
         )
-        .group_by(Product.id, Product.name, Product.base_unit)
+        .group_by(SaleItem.product_id)
     )
 
     if search:
-        base_query = base_query.filter(Product.name.ilike(f"%{search}%"))
+        per_product = per_product.where(
+            SaleItem.product_id.in_(
+                select(Product.id).where(
+                    Product.business_id == business_id,
+                    Product.name.ilike(f"%{search}%"),
+                )
+            )
+        )
 
-    total_products = base_query.count()
+    per_product = per_product.subquery("per_product")
 
-    results = (
-        base_query
-        .order_by(func.sum(SaleItem.line_total).desc())
+    cost = per_product.c.cost
+
+    # COUNT OVER runs before LIMIT, so the page carries the total
+    results = db.execute(
+        select(
+            per_product.c.product_id,
+            Product.name.label("product_name"),
+            Product.base_unit,
+            per_product.c.quantity.label("total_quantity_sold"),
+            _amount(per_product.c.revenue).label("total_revenue"),
+            _amount(cost).label("total_cost"),
+            _amount(per_product.c.revenue - cost).label("total_profit"),
+            _kobo(_amount(per_product.c.revenue)).label("total_revenue_kobo"),
+            _kobo(_amount(cost)).label("total_cost_kobo"),
+            _kobo(_amount(per_product.c.revenue - cost)).label("total_profit_kobo"),
+            func.count().over().label("total_products"),
+        )
+        .join(Product, Product.id == per_product.c.product_id)
+        .order_by(per_product.c.revenue.desc())
         .limit(limit)
         .offset(offset)
-        .all()
-    )
+    ).all()
 
-    formatted_results = []
-
-    for row in results:
-        total_revenue = Decimal(row.total_revenue or 0)
-        total_cost = Decimal(row.total_cost or 0)
-        total_profit = total_revenue - total_cost
-
-        formatted_results.append(
-            ProductProfitResponse(
-                product_id=row.product_id,
-                product_name=row.product_name,
-                base_unit=row.base_unit,
-                total_quantity_sold=row.total_quantity_sold,
-                total_revenue=total_revenue,
-                total_cost=total_cost,
-                total_profit=total_profit,
-            )
+    if results:
+        total_products = results[0].total_products
+    elif offset == 0:
+        total_products = 0
+    else:
+        # Pages past the end have no row carrying the total
+        total_products = db.scalar(select(func.count()).select_from(per_product))
+
+    # Money columns already come back as NUMERIC(18, 2) Decimals, so skip
+    # per-row validation. The quantity sum is NUMERIC and is the one field
+    # that needs converting to the schema's int
+    construct = ProductProfitResponse.model_construct
+
+    formatted_results = [
+        construct(
+            product_id=row.product_id,
+            product_name=row.product_name,
+            base_unit=row.base_unit,
+            total_quantity_sold=int(row.total_quantity_sold),
+            total_revenue=row.total_revenue,
+            total_cost=row.total_cost,
+            total_profit=row.total_profit,
+            total_revenue_kobo=row.total_revenue_kobo,
+            total_cost_kobo=row.total_cost_kobo,
+            total_profit_kobo=row.total_profit_kobo,
         )
+        for row in results
+    ]
 
-    return {
-        "start_date": start_date,
-        "end_date": end_date,
-        "total_products": total_products,
-        "results": formatted_results,
-    }
+    return _PRODUCT_PROFIT_ADAPTER.dump_json(
+        ProductProfitReportResponse.model_construct(
+            start_date=start_date,
+            end_date=end_date,
+            total_products=total_products,
+            results=formatted_results,
+        )
+    )
 
 
-# =========================================================
-# DAILY REPORT (FREE)
-# =========================================================
+def _json_response(content: bytes, response: Response) -> Response:
+    # A returned Response skips FastAPI's header merge, so carry over
+    # what dependencies set (ETag, Cache-Control)
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
 
 # =========================================================
 # DAILY REPORT (PROFIT LOCKED FOR FREE USERS)
 # =========================================================
-@router.get("/daily", response_model=SalesReportResponse)
-def daily_report(
+@router.get("/daily", response_model=SalesReportResponse, dependencies=[Depends(report_etag)])
+async def daily_report(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     today = get_nigerian_date()
     
-    report = _calculate_report(
+    report = await _calculate_report_async(
         db,
         current_user.business_id,
         today,
@@ -225,12 +358,14 @@ def daily_report(
     )
     
     # Check if user has active subscription
-    subscription = get_active_subscription(db, current_user.business_id)
+    subscription = await get_active_subscription_async(db, current_user.business_id)
     
     if not subscription:
         # Free user - hide cost, profit, and margin (return "0.00" instead of None)
         report["total_cost"] = Decimal("0.00")
         report["total_profit"] = Decimal("0.00")
+        report["total_cost_kobo"] = 0
+        report["total_profit_kobo"] = 0
         report["profit_margin_percentage"] = Decimal("0.00")
     
     return report
@@ -238,71 +373,62 @@ def daily_report(
 # =========================================================
 # WEEKLY REPORT (PROFIT LOCKED)
 # =========================================================
-@router.get("/weekly", response_model=SalesReportResponse)
-def weekly_report(
+@router.get("/weekly", response_model=SalesReportResponse, dependencies=[Depends(report_etag)])
+async def weekly_report(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     today = get_nigerian_date()
     start_date = today - timedelta(days=6)
 
-    report = _calculate_report(
+    subscription = await require_subscription_async(
         db,
         current_user.business_id,
-        start_date,
-        today,
+        "weekly",
     )
 
-    subscription = require_subscription(
+    # Without a plan, cost and profit come back as zero and are never queried
+    return await _calculate_report_async(
         db,
         current_user.business_id,
-        "weekly",
+        start_date,
+        today,
+        include_cost=bool(subscription),
     )
 
-    if not subscription:
-        report["total_cost"] = Decimal("0.00")
-        report["total_profit"] = Decimal("0.00")
-        report["profit_margin_percentage"] = Decimal("0.00")
-
-    return report
-
 
 # =========================================================
 # MONTHLY REPORT (PROFIT LOCKED)
 # =========================================================
-@router.get("/monthly", response_model=SalesReportResponse)
-def monthly_report(
+@router.get("/monthly", response_model=SalesReportResponse, dependencies=[Depends(report_etag)])
+async def monthly_report(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     today = get_nigerian_date()
     start_date = today - timedelta(days=29)
 
-    report = _calculate_report(
+    subscription = await require_subscription_async(
         db,
         current_user.business_id,
-        start_date,
-        today,
+        "monthly",
     )
 
-    subscription = require_subscription(
+    # Without a plan, cost and profit come back as zero and are never queried
+    return await _calculate_report_async(
         db,
         current_user.business_id,
-        "monthly",
+        start_date,
+        today,
+        include_cost=bool(subscription),
     )
 
-    if not subscription:
-        report["total_cost"] = Decimal("0.00")
-        report["total_profit"] = Decimal("0.00")
-        report["profit_margin_percentage"] = Decimal("0.00")
-
-    return report
-
 # =========================================================
 # DAILY PRODUCT PROFIT (LOCKED FOR FREE USERS)
 # =========================================================
-@router.get("/daily/products", response_model=ProductProfitReportResponse)
-def daily_product_profit(
+@router.get("/daily/products", response_model=ProductProfitReportResponse, dependencies=[Depends(report_etag)])
+async def daily_product_profit(
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
     search: Optional[str] = Query(None),
@@ -310,7 +436,7 @@ def daily_product_profit(
     offset: int = Query(0, ge=0),
 ):
     # Check if user has active subscription
-    subscription = get_active_subscription(db, current_user.business_id)
+    subscription = await get_active_subscription_async(db, current_user.business_id)
     
     if not subscription:
         # Free user - return empty product list
@@ -324,7 +450,7 @@ def daily_product_profit(
     
     today = get_nigerian_date()
 
-    return _calculate_product_profit(
+    content = await _calculate_product_profit(
         db=db,
         business_id=current_user.business_id,
         start_date=today,
@@ -334,19 +460,22 @@ def daily_product_profit(
         offset=offset,
     )
 
+    return _json_response(content, response)
+
 
 # =========================================================
 # WEEKLY PRODUCT PROFIT (LOCKED)
 # =========================================================
-@router.get("/weekly/products", response_model=ProductProfitReportResponse)
-def weekly_product_profit(
+@router.get("/weekly/products", response_model=ProductProfitReportResponse, dependencies=[Depends(report_etag)])
+async def weekly_product_profit(
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
     search: Optional[str] = Query(None),
     limit: int = Query(20, ge=1),
     offset: int = Query(0, ge=0),
 ):
-    subscription = require_subscription(
+    subscription = await require_subscription_async(
         db,
         current_user.business_id,
         "weekly",
@@ -361,7 +490,7 @@ def weekly_product_profit(
     today = get_nigerian_date()
     start_date = today - timedelta(days=6)
 
-    return _calculate_product_profit(
+    content = await _calculate_product_profit(
         db=db,
         business_id=current_user.business_id,
         start_date=start_date,
@@ -371,19 +500,22 @@ def weekly_product_profit(
         offset=offset,
     )
 
+    return _json_response(content, response)
+
 
 # =========================================================
 # MONTHLY PRODUCT PROFIT (LOCKED)
 # =========================================================
-@router.get("/monthly/products", response_model=ProductProfitReportResponse)
-def monthly_product_profit(
+@router.get("/monthly/products", response_model=ProductProfitReportResponse, dependencies=[Depends(report_etag)])
+async def monthly_product_profit(
+    response: Response,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
     search: Optional[str] = Query(None),
     limit: int = Query(20, ge=1),
     offset: int = Query(0, ge=0),
 ):
-    subscription = require_subscription(
+    subscription = await require_subscription_async(
         db,
         current_user.business_id,
         "monthly",
@@ -398,7 +530,7 @@ def monthly_product_profit(
     today = get_nigerian_date()
     start_date = today - timedelta(days=29)
 
-    return _calculate_product_profit(
+    content = await _calculate_product_profit(
         db=db,
         business_id=current_user.business_id,
         start_date=start_date,
@@ -408,18 +540,20 @@ def monthly_product_profit(
         offset=offset,
     )
 
+    return _json_response(content, response)
+
 
 # =========================================================
 # PROFIT TREND (PAID ONLY)
 # =========================================================
-@router.get("/trend")
-def profit_trend(
+@router.get("/trend", dependencies=[Depends(report_etag)])
+async def profit_trend(
     period: str = Query(..., pattern="^(weekly|monthly)$"),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
 
-    subscription = require_subscription(
+    subscription = await require_subscription_async(
         db,
         current_user.business_id,
         period,
@@ -433,66 +567,99 @@ def profit_trend(
 
     today = get_nigerian_date()
 
-    trend_data = []
+    return await cached_report_async(
+        (current_user.business_id, "trend", period, today),
+        lambda: _build_profit_trend(db, current_user.business_id, period, today),
+    )
 
-    # For weekly, we want to show the profit for each of the last 7 days
-    if period == "weekly":
-        for i in range(6, -1, -1):
-            day = today - timedelta(days=i)
-            result = _calculate_report(
-                db,
-                current_user.business_id,
-                day,
-                day,
-            )
-            trend_data.append({
-                "date": day,
-                "profit": result["total_profit"],
-            })
 
-    
-    
-    # For monthly, we want to show the profit for the last 3 months (including current month)
-    else:  # monthly
+def _build_profit_trend(db: Session, business_id: int, period: str, today: date):
 
-        current_year = today.year
-        current_month = today.month
+    # For weekly, we want to show the profit for each of the last 7 days.
+    # For monthly, the last 3 months (including current month)
+    if period == "weekly":
+        bucket_unit = "day"
+        buckets = [today - timedelta(days=i) for i in range(6, -1, -1)]
+        last_day = today
+    else:
+        bucket_unit = "month"
+        buckets = []
 
         for i in range(0, 3):
-
             # Calculate target month
-            target_month = current_month - i
-            target_year = current_year
+            target_month = today.month - i
+            target_year = today.year
 
             while target_month <= 0:
                 target_month += 12
                 target_year -= 1
 
-        # First day of that month
-            month_start = date(target_year, target_month, 1)
+            buckets.append(date(target_year, target_month, 1))
 
-        # Last day of that month
-            last_day = monthrange(target_year, target_month)[1]
-            month_end = date(target_year, target_month, last_day)
+        last_day = date(today.year, today.month, monthrange(today.year, today.month)[1])
 
-            result = _calculate_report(
-                db,
-                current_user.business_id,
-                month_start,
-                month_end,
-            )
+    start_dt, end_dt = lagos_day_range_utc(min(buckets), last_day)
+
+    base_filter = [
+        Sale.business_id == business_id,
+        Sale.created_at >= start_dt,
+        Sale.created_at < end_dt,
+    ]
+
+    # Nigerian calendar day / month of each sale
+    bucket = func.date_trunc(
+        bucket_unit, func.timezone("Africa/Lagos", Sale.created_at)
+    ).label("bucket")
+
+    revenue_per_bucket = (
+        select(bucket, func.sum(Sale.total_amount).label("revenue"))
+        .where(*base_filter)
+        .group_by("bucket")
+        .subquery()
+    )
+
+    cost_per_bucket = (
+        select(bucket, func.sum(SaleItem.cost_price * SaleItem.quantity).label("cost"))
+        .select_from(SaleItem)
+        .join(Sale, SaleItem.sale_id == Sale.id)
+        .where(*base_filter)
+        .group_by("bucket")
+        .subquery()
+    )
 
-            trend_data.append({
-                "month_start": month_start,
-                "profit": result["total_profit"],
-          })
+    # Every bucket in one query instead of one report per day/month
+    rows = db.execute(
+        select(
+            revenue_per_bucket.c.bucket,
+            _amount(
+                revenue_per_bucket.c.revenue - func.coalesce(cost_per_bucket.c.cost, 0)
+            ).label("profit"),
+        ).outerjoin(
+            cost_per_bucket,
+            cost_per_bucket.c.bucket == revenue_per_bucket.c.bucket,
+        )
+    ).all()
+
+    profit_by_bucket = {
+        row.bucket.date(): row.profit
+        for row in rows
+    }
 
-    return trend_data
+    # Days/months without sales still appear, with zero profit
+    date_key = "date" if period == "weekly" else "month_start"
+
+    return [
+        {
+            date_key: bucket_start,
+            "profit": profit_by_bucket.get(bucket_start, Decimal("0.00")),
+        }
+        for bucket_start in buckets
+    ]
 
 # =========================================================
 # END OF DAY BUSINESS SUMMARY
 # =========================================================
-@router.get("/end-of-day")
+@router.get("/end-of-day", dependencies=[Depends(report_etag)])
 def end_of_day_summary(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
@@ -544,10 +711,7 @@ def end_of_day_summary(
     ]
 
     # Get top selling product (name only for free users)
-    nigeria_tz = pytz.timezone("Africa/Lagos")
-    start_of_today = datetime.now(nigeria_tz).replace(hour=0, minute=0, second=0, microsecond=0)
-    start_of_today_utc = start_of_today.astimezone(pytz.utc)
-    end_of_today_utc = start_of_today_utc + timedelta(days=1)
+    start_of_today_utc, end_of_today_utc = lagos_day_range_utc(today, today)
 
     top_product = (
         db.query(
@@ -574,7 +738,7 @@ def end_of_day_summary(
             db.query(
                 Product.name,
                 func.sum(
-                    (Product.selling_price - Product.cost_price) * SaleItem.quantity
+                    SaleItem.line_total - SaleItem.cost_price * SaleItem.quantity
                 ).label("profit")
             )
             .join(SaleItem, SaleItem.product_id == Product.id)
@@ -587,7 +751,7 @@ def end_of_day_summary(
             .group_by(Product.name)
             .order_by(
                 func.sum(
-                    (Product.selling_price - Product.cost_price) * SaleItem.quantity
+                    SaleItem.line_total - SaleItem.cost_price * SaleItem.quantity
                 ).desc()
             )
             .first()
@@ -13,15 +13,21 @@
 # =========================================================
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import case, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
 from decimal import Decimal
-from datetime import timedelta, datetime
+from datetime import timedelta
 import pytz
 
 from app.database import get_db
 from app.core.auth import get_current_user
-from app.core.subscription import get_active_subscription
+from app.core.subscription import current_subscription, free_tier_cutoff
+from app.core.rollups import record_sale
+from app.core.report_cache import bump_data_version
 from app.models.sales import Sale
 from app.models.sale_items import SaleItem
 from app.models.products import Product
@@ -33,15 +39,64 @@ from app.core.rate_limiter import limiter
 
 router = APIRouter(prefix="/sales", tags=["Sales"])
 
+# Sale bodies are parsed and validated in one pydantic-core pass over the
+# raw bytes, skipping the intermediate dict built by request.json()
+_SALE_ADAPTER = TypeAdapter(SaleCreate)
+
+
+def _inline_schema(model) -> dict:
+    # OpenAPI can't resolve the "#/$defs/..." refs pydantic emits, so
+    # nested models are inlined
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return resolve(defs[ref.rsplit("/", 1)[-1]])
+            return {key: resolve(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [resolve(value) for value in node]
+        return node
+
+    return resolve(schema)
+
+
+_SALE_BODY_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": _inline_schema(SaleCreate)}},
+    }
+}
+
+
+async def sale_body(request: Request) -> SaleCreate:
+    try:
+        return _SALE_ADAPTER.validate_json(await request.body())
+    except ValidationError as exc:
+        # Same 422 shape FastAPI produces for a declared body
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+        )
+
 
 # =========================================================
 # CREATE SALE
 # =========================================================
-@router.post("", response_model=SaleResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=SaleResponse,
+    status_code=status.HTTP_201_CREATED,
+    openapi_extra=_SALE_BODY_OPENAPI,
+)
 @limiter.limit("30/minute")
 def create_sale(
     request: Request,
-    sale_data: SaleCreate,
+    sale_data: SaleCreate = Depends(sale_body),
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -52,58 +107,100 @@ def create_sale(
     if len(product_ids) != len(set(product_ids)):
         raise HTTPException(status_code=400, detail="Duplicate products in sale are not allowed")
 
-    # ===============================
-    # IDEMPOTENCY CHECK
-    # ===============================
-    existing_sale = (
-        db.query(Sale)
-        .filter(
-            Sale.business_id == current_user.business_id,
-            Sale.request_id == sale_data.request_id,
-        )
-        .first()
-    )
-
-    if existing_sale:
-        return existing_sale
-
     total_amount = Decimal("0.00")
-    sale_items_objects = []
+    total_cost = Decimal("0.00")
+    sale_item_rows = []
+    deductions = {}
 
     try:
-        sale = Sale(
-            business_id=current_user.business_id,
-            total_amount=Decimal("0.00"),
-            request_id=sale_data.request_id,
+        # ===============================
+        # IDEMPOTENT INSERT
+        # ===============================
+        # uq_business_request_id makes the duplicate check and the insert
+        # one atomic statement; a concurrent retry waits for the first
+        # request and then inserts nothing
+        sale = db.scalars(
+            insert(Sale)
+            .values(
+                business_id=current_user.business_id,
+                total_amount=Decimal("0.00"),
+                request_id=sale_data.request_id,
+            )
+            .on_conflict_do_nothing(constraint="uq_business_request_id")
+            .returning(Sale)
+        ).first()
+
+        if sale is None:
+            db.rollback()
+
+            # Already recorded: return the original sale
+            return (
+                db.query(Sale)
+                .options(joinedload(Sale.items))
+                .filter(
+                    Sale.business_id == current_user.business_id,
+                    Sale.request_id == sale_data.request_id,
+                )
+                .one()
+            )
+
+        # ====================================
+        # BATCH LOAD PRODUCTS, STOCK, UNITS
+        # ====================================
+
+        products = {
+            product.id: product
+            for product in db.query(Product).filter(
+                Product.id.in_(product_ids),
+                Product.business_id == current_user.business_id,
+            )
+        }
+
+        # product_id -> inventory id. Not locked here: the stock check
+        # and deduction happen atomically in the UPDATE below
+        inventory_ids = dict(
+            db.execute(
+                select(Inventory.product_id, Inventory.id).where(
+                    Inventory.product_id.in_(products.keys()),
+                    Inventory.business_id == current_user.business_id,
+                )
+            ).all()
         )
-        db.add(sale)
-        db.flush()
+
+        converted_units = {
+            (item.product_id, item.unit)
+            for item in sale_data.items
+            if item.product_id in products
+            and item.unit != products[item.product_id].base_unit
+        }
+
+        conversions = {}
+        if converted_units:
+            conversions = {
+                (conversion.product_id, conversion.unit_name): conversion
+                for conversion in db.query(ProductUnitConversion).filter(
+                    ProductUnitConversion.product_id.in_(
+                        {product_id for product_id, _ in converted_units}
+                    ),
+                    ProductUnitConversion.unit_name.in_(
+                        {unit for _, unit in converted_units}
+                    ),
+                )
+            }
 
         for item in sale_data.items:
 
             if item.quantity is None or item.quantity <= 0:
                 raise HTTPException(status_code=400, detail="Item quantity must be greater than zero")
 
-            product = (
-                db.query(Product)
-                .filter(
-                    Product.id == item.product_id,
-                    Product.business_id == current_user.business_id,
-                )
-                .first()
-            )
+            product = products.get(item.product_id)
 
             if not product:
                 raise HTTPException(status_code=404, detail="Product not found")
 
-            inventory = (
-                db.query(Inventory)
-                .filter(Inventory.product_id == product.id)
-                .with_for_update()
-                .first()
-            )
+            inventory_id = inventory_ids.get(product.id)
 
-            if not inventory:
+            if not inventory_id:
                 raise HTTPException(status_code=400, detail=f"No inventory for {product.name}")
 
             # ====================================
@@ -116,14 +213,7 @@ def create_sale(
             if sale_unit == product.base_unit:
                 deduction = quantity
             else:
-                conversion = (
-                    db.query(ProductUnitConversion)
-                    .filter(
-                        ProductUnitConversion.product_id == product.id,
-                        ProductUnitConversion.unit_name == sale_unit,
-                    )
-                    .first()
-                )
+                conversion = conversions.get((product.id, sale_unit))
 
                 if not conversion:
                     raise HTTPException(
@@ -133,43 +223,63 @@ def create_sale(
 
                 deduction = quantity * Decimal(conversion.conversion_rate)
 
-            # ====================================
-            # STOCK CHECK
-            # ====================================
-
-            if inventory.quantity_available < deduction:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Insufficient stock for {product.name}",
-                )
-
             # ====================================
             # LINE TOTAL
             # ====================================
 
             line_total = product.selling_price * deduction
             total_amount += line_total
+            total_cost += product.cost_price * deduction
 
-            # ====================================
-            # DEDUCT INVENTORY
-            # ====================================
+            deductions[inventory_id] = (deduction, product.name)
 
-            inventory.quantity_available -= deduction
+            sale_item_rows.append({
+                "sale_id": sale.id,
+                "product_id": product.id,
+                "quantity": deduction,
+                "unit_name": sale_unit,
+                "selling_price": product.selling_price,
+                "line_total": line_total,
+                "cost_price": product.cost_price,
+            })
 
-            sale_items_objects.append(
-                SaleItem(
-                    sale_id=sale.id,
-                    product_id=product.id,
-                    quantity=deduction,
-                    unit_name=sale_unit,
-                    selling_price=product.selling_price,
-                    line_total=line_total,
+        sale.total_amount = total_amount
+
+        # ====================================
+        # STOCK CHECK + DEDUCT INVENTORY
+        # ====================================
+        # One UPDATE checks and deducts every line atomically; rows are
+        # only locked from here to the commit. A row missing from
+        # RETURNING did not have enough stock
+        deduction_by_id = case(
+            {inventory_id: amount for inventory_id, (amount, _) in deductions.items()},
+            value=Inventory.id,
+        )
+
+        deducted = set(
+            db.scalars(
+                update(Inventory)
+                .where(
+                    Inventory.id.in_(deductions.keys()),
+                    Inventory.quantity_available >= deduction_by_id,
                 )
+                .values(quantity_available=Inventory.quantity_available - deduction_by_id)
+                .returning(Inventory.id)
+                .execution_options(synchronize_session=False)
             )
+        )
 
-        sale.total_amount = total_amount
-        db.add_all(sale_items_objects)
-        
+        for inventory_id, (_, product_name) in deductions.items():
+            if inventory_id not in deducted:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient stock for {product_name}",
+                )
+
+        # One multi-row INSERT for the items instead of one per item
+        db.execute(insert(SaleItem), sale_item_rows)
+
+        record_sale(db, current_user.business_id, total_amount, total_cost)
 
         # ====================================
         # UPDATE STREAK FOR BUSINESS
@@ -201,6 +311,7 @@ def create_sale(
             business.last_sale_date = sale_nigerian_date
             business.current_streak = new_streak
             
+        bump_data_version(db, current_user.business_id)
         db.commit()
         db.refresh(sale)    
 
@@ -215,6 +326,55 @@ def create_sale(
         raise HTTPException(status_code=500, detail="Unable to complete sale")
 
 
+# =========================================================
+# SALE LISTING HELPER
+# =========================================================
+def _fetch_sales(db: Session, sales_stmt):
+    """
+    Run a select of (id, total_amount, created_at) sale rows and attach
+    their items from one IN query. Only the response's columns are read,
+    as plain rows: no ORM objects are built for sales or items.
+    """
+    sales = [
+        {
+            "id": row.id,
+            "total_amount": row.total_amount,
+            "created_at": row.created_at,
+            "items": [],
+        }
+        for row in db.execute(sales_stmt)
+    ]
+
+    if not sales:
+        return sales
+
+    sales_by_id = {sale["id"]: sale for sale in sales}
+
+    item_rows = db.execute(
+        select(
+            SaleItem.sale_id,
+            SaleItem.product_id,
+            SaleItem.quantity,
+            SaleItem.unit_name,
+            SaleItem.selling_price,
+            SaleItem.line_total,
+        )
+        .where(SaleItem.sale_id.in_(sales_by_id.keys()))
+        .order_by(SaleItem.id)
+    )
+
+    for item in item_rows:
+        sales_by_id[item.sale_id]["items"].append({
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "unit_name": item.unit_name,
+            "selling_price": item.selling_price,
+            "line_total": item.line_total,
+        })
+
+    return sales
+
+
 # =========================================================
 # LIST SALES (HISTORY LOCK APPLIED)
 # =========================================================
@@ -222,32 +382,26 @@ def create_sale(
 def list_sales(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    subscription=Depends(current_subscription),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
 ):
-    subscription = get_active_subscription(db, current_user.business_id)
-
     query = (
-        db.query(Sale)
-        .options(joinedload(Sale.items))
-        .filter(Sale.business_id == current_user.business_id)
+        select(Sale.id, Sale.total_amount, Sale.created_at)
+        .where(Sale.business_id == current_user.business_id)
     )
 
     if not subscription:
-        tz = pytz.timezone('Africa/Lagos')
-        seven_days_ago = datetime.now(tz) - timedelta(days=6)
-        query = query.filter(Sale.created_at >= seven_days_ago)
+        query = query.where(Sale.created_at >= free_tier_cutoff())
 
-    sales = (
+    return _fetch_sales(
+        db,
         query
         .order_by(Sale.created_at.desc())
         .limit(limit)
-        .offset(offset)
-        .all()
+        .offset(offset),
     )
 
-    return sales
-
 
 # =========================================================
 # GET ALL SALES (FOR DASHBOARD METRICS ONLY)
@@ -256,22 +410,18 @@ def list_sales(
 def list_all_sales_for_dashboard(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    subscription=Depends(current_subscription),
 ):
-    subscription = get_active_subscription(db, current_user.business_id)
-
     query = (
-        db.query(Sale)
-        .options(joinedload(Sale.items))
-        .filter(Sale.business_id == current_user.business_id)
+        select(Sale.id, Sale.total_amount, Sale.created_at)
+        .where(Sale.business_id == current_user.business_id)
         .order_by(Sale.created_at.desc())
     )
 
     if not subscription:
-        tz = pytz.timezone('Africa/Lagos')
-        seven_days_ago = datetime.now(tz) - timedelta(days=6)
-        query = query.filter(Sale.created_at >= seven_days_ago)
+        query = query.where(Sale.created_at >= free_tier_cutoff())
 
-    return query.all()
+    return _fetch_sales(db, query)
 
 
 # =========================================================
@@ -282,6 +432,7 @@ def get_sale(
     sale_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user),
+    subscription=Depends(current_subscription),
 ):
     sale = (
         db.query(Sale)
@@ -299,13 +450,8 @@ def get_sale(
             detail="Sale not found",
         )
 
-    subscription = get_active_subscription(db, current_user.business_id)
-
     if not subscription:
-        tz = pytz.timezone('Africa/Lagos')
-        seven_days_ago = datetime.now(tz) - timedelta(days=6)
-        
-        if sale.created_at < seven_days_ago:
+        if sale.created_at < free_tier_cutoff():
             raise HTTPException(
                 status_code=402,
                 detail="Upgrade to access historical sales",
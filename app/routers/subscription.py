@@ -1,24 +1,14 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from datetime import datetime, timezone
 
-from app.database import get_db
-from app.core.auth import get_current_user
-from app.core.subscription import get_active_subscription
+from app.core.subscription import current_subscription
 
 router = APIRouter(prefix="/subscription", tags=["Subscription"])
 
 
 @router.get("/status")
 def subscription_status(
-    db: Session = Depends(get_db),
-    current_user=Depends(get_current_user),
+    subscription=Depends(current_subscription),
 ):
-    subscription = get_active_subscription(
-        db,
-        current_user.business_id,
-    )
-
     if not subscription:
         return {
             "active": False,
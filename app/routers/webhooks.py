@@ -8,10 +8,16 @@
 # =========================================================
 
 from decimal import Decimal
-import hmac
 import hashlib
+import hmac
 import logging
-from fastapi import APIRouter, Request, HTTPException, status, Depends
+import threading
+
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, Request, HTTPException, Response, status, Depends
+from sqlalchemy import bindparam, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 
@@ -20,32 +26,125 @@ from app.models.export_access import ExportAccess
 from app.models.business import Business
 from app.core.config import settings
 from app.core.rate_limiter import limiter
+from app.core.subscription import PERIOD_PLANS, invalidate_subscription_cache
+from app.core.report_cache import bump_data_version
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
 
 logger = logging.getLogger("app")
 
+# Bound once at import; settings are immutable for the process lifetime.
+# The key is fixed, so its ipad/opad state is computed here once and
+# every verification starts from a copy
+_PAYSTACK_HMAC = (
+    hmac.new(settings.PAYSTACK_SECRET_KEY.encode(), digestmod="sha512")
+    if settings.PAYSTACK_SECRET_KEY
+    else None
+)
+
+_SIGNATURE_BYTES = 64
+
+# Paystack event payloads are a few KiB at most
+_MAX_BODY_BYTES = 64 * 1024
+
+# The webhook only ever answers with one of these bodies; they are
+# serialized once instead of JSON-encoding a dict per request
+_IGNORED = b'{"status":"ignored"}'
+_ALREADY_PROCESSED = b'{"status":"already_processed"}'
+_SUBSCRIPTION_ACTIVATED = b'{"status":"subscription_activated"}'
+
+
+def _status_response(body: bytes) -> Response:
+    # A fresh Response each time: FastAPI attaches per-request state
+    # (background tasks) to the object it is handed
+    return Response(content=body, media_type="application/json")
+
+
+# Transaction references already recorded. Paystack retries the same
+# reference, so replays are answered without touching the database
+_processed_references = TTLCache(maxsize=10_000, ttl=24 * 60 * 60)
+_processed_references_lock = threading.Lock()
+
+# HMAC only runs inside OpenSSL when hashlib is OpenSSL-backed; say so at startup instead of silently running slower
+if hashlib.sha512.__module__ != "_hashlib":
+    logger.warning("SHA-512 is not OpenSSL-backed; webhook HMAC will be slow")
+
+# Everything the webhook reads before inserting, in one round-trip:
+# business exists, latest active end_date. Reference idempotency is
+# left to the insert's ON CONFLICT
+WEBHOOK_STATE_STMT = select(
+    exists()
+    .where(Business.id == bindparam("business_id"))
+    .label("business_exists"),
+    select(func.max(ExportAccess.end_date))
+    .where(
+        ExportAccess.business_id == bindparam("business_id"),
+        ExportAccess.period_type == bindparam("period_type"),
+        ExportAccess.end_date >= bindparam("today"),
+    )
+    .scalar_subquery()
+    .label("latest_end_date"),
+)
+
+
+def _decode_signature(signature: str) -> bytes:
+    # HMAC-SHA512 header: 128 hex chars. Checked before the body is read,
+    # so malformed requests are turned away without buffering the payload
+    try:
+        decoded = bytes.fromhex(signature)
+    except ValueError:
+        decoded = b""
+
+    if len(decoded) != _SIGNATURE_BYTES:
+        logger.warning("Malformed Paystack signature")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid Paystack signature",
+        )
+
+    return decoded
+
+
+def _payload_too_large(size) -> HTTPException:
+    logger.warning(f"Oversized webhook body: {size} bytes")
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail="Payload too large",
+    )
+
 
-def _verify_paystack_signature(request_body: bytes, signature: str):
-    if not settings.PAYSTACK_SECRET_KEY:
+async def _read_signed_body(request: Request, expected: bytes) -> bytearray:
+    """
+    Read the body and verify its signature in the same pass: each chunk
+    is fed to the HMAC as it arrives instead of re-scanning the buffer.
+    """
+    if _PAYSTACK_HMAC is None:
         raise HTTPException(
             status_code=500,
             detail="Paystack secret key not configured",
         )
 
-    computed_signature = hmac.new(
-        settings.PAYSTACK_SECRET_KEY.encode(),
-        request_body,
-        hashlib.sha512,
-    ).hexdigest()
+    # Keyed state is copied, not rebuilt
+    mac = _PAYSTACK_HMAC.copy()
+    body = bytearray()
+
+    async for chunk in request.stream():
+        mac.update(chunk)
+        body += chunk
 
-    if not hmac.compare_digest(computed_signature, signature):
+        # Also bounds chunked bodies that declare no Content-Length
+        if len(body) > _MAX_BODY_BYTES:
+            raise _payload_too_large(len(body))
+
+    if not hmac.compare_digest(mac.digest(), expected):
         logger.warning("Invalid Paystack signature attempt")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Paystack signature",
         )
 
+    return body
+
 
 @router.post("/paystack")
 @limiter.limit("20/minute")
@@ -61,13 +160,23 @@ async def paystack_webhook(
             detail="Missing Paystack signature",
         )
 
-    raw_body = await request.body()
-    _verify_paystack_signature(raw_body, signature)
+    expected_signature = _decode_signature(signature)
 
-    payload = await request.json()
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > _MAX_BODY_BYTES:
+        raise _payload_too_large(content_length)
+
+    raw_body = await _read_signed_body(request, expected_signature)
+
+    # Parsed from the bytes already read for the signature check
+    try:
+        payload = orjson.loads(raw_body)
+    except orjson.JSONDecodeError:
+        logger.error("Webhook body is not valid JSON")
+        raise HTTPException(status_code=400, detail="Invalid payload")
 
     if payload.get("event") != "charge.success":
-        return {"status": "ignored"}
+        return _status_response(_IGNORED)
 
     data = payload.get("data", {})
     metadata = data.get("metadata", {})
@@ -77,7 +186,9 @@ async def paystack_webhook(
     amount_kobo = data.get("amount")
     reference = data.get("reference")
 
-    if not business_id or period_type not in {"weekly", "monthly"}:
+    plan = PERIOD_PLANS.get(period_type)
+
+    if not business_id or plan is None:
         logger.error("Invalid metadata in webhook")
         raise HTTPException(status_code=400, detail="Invalid payment metadata")
 
@@ -85,68 +196,75 @@ async def paystack_webhook(
         logger.error("Missing reference in webhook")
         raise HTTPException(status_code=400, detail="Missing transaction reference")
 
-    expected_amount = 50000 if period_type == "weekly" else 150000
+    expected_amount, plan_days = plan
 
     if amount_kobo != expected_amount:
         logger.error(f"Incorrect payment amount: {amount_kobo}")
         raise HTTPException(status_code=400, detail="Incorrect payment amount")
 
+    with _processed_references_lock:
+        if reference in _processed_references:
+            return _status_response(_ALREADY_PROCESSED)
+
+    today = datetime.now(timezone.utc).date()
+
+    state = db.execute(
+        WEBHOOK_STATE_STMT,
+        {
+            "business_id": business_id,
+            "period_type": period_type,
+            "today": today,
+        },
+    ).one()
+
     # Verify business exists
-    business_exists = db.query(Business).filter(Business.id == business_id).first()
-    if not business_exists:
+    if not state.business_exists:
         logger.error(f"Business not found: {business_id}")
         raise HTTPException(status_code=400, detail="Invalid business")
 
-    existing_reference = (
-        db.query(ExportAccess)
-        .filter(ExportAccess.transaction_reference == reference)
-        .first()
-    )
-
-    if existing_reference:
-        return {"status": "already_processed"}
+    if state.latest_end_date:
+        start_date = state.latest_end_date + timedelta(days=1)
+    else:
+        start_date = today
 
-    today = datetime.now(timezone.utc).date()
+    end_date = start_date + timedelta(days=plan_days)
 
-    active_subscription = (
-        db.query(ExportAccess)
-        .filter(
-            ExportAccess.business_id == business_id,
-            ExportAccess.period_type == period_type,
-            ExportAccess.end_date >= today,
+    # Unique transaction_reference makes a replay insert nothing
+    try:
+        access_id = db.scalar(
+            insert(ExportAccess)
+            .values(
+                business_id=business_id,
+                period_type=period_type,
+                start_date=start_date,
+                end_date=end_date,
+                amount_paid=Decimal(expected_amount) / Decimal("100"),
+                transaction_reference=reference,
+            )
+            .on_conflict_do_nothing(constraint="uq_export_access_reference")
+            .returning(ExportAccess.id)
         )
-        .order_by(ExportAccess.end_date.desc())
-        .first()
-    )
 
-    if active_subscription:
-        start_date = active_subscription.end_date + timedelta(days=1)
-    else:
-        start_date = today    
-                
-    if period_type == "weekly":
-        end_date = start_date + timedelta(days=6)
-    else:
-        end_date = start_date + timedelta(days=29)
-
-    access = ExportAccess(
-        business_id=business_id,
-        period_type=period_type,
-        start_date=start_date,
-        end_date=end_date,
-        amount_paid= Decimal(expected_amount) / Decimal("100"),
-        transaction_reference=reference,
-    )
+        # Report and export output depends on the plan
+        if access_id is not None:
+            bump_data_version(db, int(business_id))
 
-    try:
-        db.add(access)
         db.commit()
     except Exception:
         db.rollback()
-        raise    
+        raise
+
+    with _processed_references_lock:
+        _processed_references[reference] = True
+
+    if access_id is None:
+        return _status_response(_ALREADY_PROCESSED)
+
+    # New plan must be visible immediately, not after the cache TTL
+    invalidate_subscription_cache(int(business_id))
 
     logger.info(
         f"Subscription activated for business {business_id} ({period_type})"
     )
 
-    return {"status": "subscription_activated"}
\ No newline at end of file
+    return _status_response(_SUBSCRIPTION_ACTIVATED)
\ No newline at end of file
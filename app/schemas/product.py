@@ -1,7 +1,7 @@
 # app/schemas/product.py
 
 from decimal import Decimal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
@@ -43,5 +43,10 @@ class ProductResponse(BaseModel):
     selling_price: Decimal
     created_at: datetime
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductListResponse(BaseModel):
+    items: list[ProductResponse]
+    # Pass as `after` to fetch the next page; None on the last page
+    next_cursor: int | None
@@ -1,16 +1,21 @@
 # schemas/report.py
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
 from decimal import Decimal
 from typing import List
 
 
 
+# Money is also returned as int kobo (1 NGN = 100 kobo), the unit
+# Paystack uses. The Decimal naira fields are kept for older clients.
 class SalesReportResponse(BaseModel):
-    total_sales: Decimal
-    total_cost: Decimal
-    total_profit: Decimal
+    total_sales: Decimal = Field(deprecated="Use total_sales_kobo")
+    total_cost: Decimal = Field(deprecated="Use total_cost_kobo")
+    total_profit: Decimal = Field(deprecated="Use total_profit_kobo")
+    total_sales_kobo: int
+    total_cost_kobo: int
+    total_profit_kobo: int
     profit_margin_percentage: Decimal
     total_orders: int
     total_items_sold: int
@@ -23,9 +28,12 @@ class ProductProfitResponse(BaseModel):
     product_name: str
     base_unit: str
     total_quantity_sold: int
-    total_revenue: Decimal
-    total_cost: Decimal
-    total_profit: Decimal
+    total_revenue: Decimal = Field(deprecated="Use total_revenue_kobo")
+    total_cost: Decimal = Field(deprecated="Use total_cost_kobo")
+    total_profit: Decimal = Field(deprecated="Use total_profit_kobo")
+    total_revenue_kobo: int
+    total_cost_kobo: int
+    total_profit_kobo: int
 
 class ProductProfitReportResponse(BaseModel):
     start_date: date
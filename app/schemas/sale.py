@@ -1,6 +1,6 @@
 # schemas/sale.py
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from typing import List
 from decimal import Decimal
@@ -34,8 +34,7 @@ class SaleItemResponse(BaseModel):
     selling_price: Decimal
     line_total: Decimal
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class SaleResponse(BaseModel):
@@ -44,5 +43,4 @@ class SaleResponse(BaseModel):
     created_at: datetime
     items: List[SaleItemResponse]
 
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Date window helpers.
+
+Report windows are whole calendar days. They are turned into half-open
+datetime ranges [start, end) so queries filter with
+created_at >= start AND created_at < end, a plain index range scan.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytz
+
+LAGOS_TZ = pytz.timezone("Africa/Lagos")
+
+_ONE_DAY = timedelta(days=1)
+
+
+def day_range(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    """Naive [start_date 00:00, day after end_date 00:00)"""
+    start = datetime(start_date.year, start_date.month, start_date.day)
+    end = datetime(end_date.year, end_date.month, end_date.day) + _ONE_DAY
+
+    return start, end
+
+
+def lagos_day_range_utc(start_date: date, end_date: date) -> tuple[datetime, datetime]:
+    """Nigerian calendar days as an aware UTC [start, end) range"""
+    start, end = day_range(start_date, end_date)
+
+    return (
+        LAGOS_TZ.localize(start).astimezone(pytz.utc),
+        LAGOS_TZ.localize(end).astimezone(pytz.utc),
+    )
@@ -0,0 +1,43 @@
+"""
+Money helpers.
+
+Amounts are handled internally as int kobo (1 NGN = 100 kobo), the same
+unit Paystack uses, and only turned into naira at the output edge
+(Excel cells, JSON responses).
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def to_kobo(amount: Decimal) -> int:
+    """Naira Decimal to int kobo (half-up, same as Postgres ROUND)"""
+    return int((amount * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def divide_half_even(numerator: int, denominator: int) -> int:
+    """Integer division rounded half-to-even (matches Decimal.quantize)"""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+
+    quotient, remainder = divmod(numerator, denominator)
+
+    if 2 * remainder > denominator or (
+        2 * remainder == denominator and quotient % 2
+    ):
+        quotient += 1
+
+    return quotient
+
+
+def percentage(part: int, whole: int) -> float:
+    """part / whole as a percentage with two decimal places"""
+    return divide_half_even(part * 10000, whole) / 100
+
+
+def ratio(part: int, whole: int) -> float:
+    """part / whole with two decimal places"""
+    return divide_half_even(part * 100, whole) / 100
+
+
+def to_naira(amount_kobo: int) -> float:
+    return amount_kobo / 100
@@ -0,0 +1,157 @@
+"""
+Minimal streaming .xlsx writer.
+
+Worksheets are written as raw SpreadsheetML straight into the zip
+archive: no cell objects, no styles, strings stored inline. It supports
+what the sales exports need: sheets written one after another, rows of
+str / int / float / Decimal / None.
+"""
+
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
+
+# Rows are buffered and handed to the compressor in chunks of this size
+WRITE_BUFFER_SIZE = 64 * 1024
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Control characters XML 1.0 forbids (same set openpyxl rejects); a single
+# one makes Excel refuse the whole file, so they are dropped from text
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "<c/>"
+
+    if isinstance(value, str):
+        # preserve: keeps leading/trailing spaces
+        value = _ILLEGAL_XML_CHARS.sub("", value)
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+
+    return _cell(str(value))
+
+
+class StreamingWorksheet:
+    def __init__(self, handle):
+        self._handle = handle
+        self._row = 0
+        self._buffer = []
+        self._buffered = 0
+
+        self._write(f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>')
+
+    def _write(self, text: str):
+        self._buffer.append(text)
+        self._buffered += len(text)
+
+        if self._buffered >= WRITE_BUFFER_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._handle.write("".join(self._buffer).encode())
+            self._buffer = []
+            self._buffered = 0
+
+    def append(self, values: list):
+        self._row += 1
+        cells = "".join(map(_cell, values))
+        self._write(f'<row r="{self._row}">{cells}</row>')
+
+    def close(self):
+        self._write("</sheetData></worksheet>")
+        self._flush()
+        self._handle.close()
+
+
+class StreamingWorkbook:
+    """
+    Write-once workbook. Only one worksheet is open at a time: adding a
+    sheet finishes the previous one. close() must be called to produce
+    a valid file.
+    """
+
+    def __init__(self, output, compresslevel: int | None = None):
+        self._zip = zipfile.ZipFile(
+            output,
+            "w",
+            compression=zipfile.ZIP_DEFLATED,
+            compresslevel=compresslevel,
+        )
+        self._sheet_names = []
+        self._sheet = None
+
+    def add_worksheet(self, name: str) -> StreamingWorksheet:
+        self._close_sheet()
+
+        self._sheet_names.append(name)
+        handle = self._zip.open(
+            f"xl/worksheets/sheet{len(self._sheet_names)}.xml",
+            "w",
+            force_zip64=True,
+        )
+        self._sheet = StreamingWorksheet(handle)
+
+        return self._sheet
+
+    def _close_sheet(self):
+        if self._sheet is not None:
+            self._sheet.close()
+            self._sheet = None
+
+    def close(self):
+        self._close_sheet()
+
+        sheet_numbers = range(1, len(self._sheet_names) + 1)
+
+        sheet_overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for n in sheet_numbers
+        )
+        self._zip.writestr(
+            "[Content_Types].xml",
+            f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f"{sheet_overrides}</Types>",
+        )
+
+        self._zip.writestr(
+            "_rels/.rels",
+            f'{_XML_HEADER}<Relationships xmlns="{_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_DOC_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            "</Relationships>",
+        )
+
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{n}" r:id="rId{n}"/>'
+            for n, name in zip(sheet_numbers, self._sheet_names)
+        )
+        self._zip.writestr(
+            "xl/workbook.xml",
+            f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_DOC_REL_NS}">'
+            f"<sheets>{sheets}</sheets></workbook>",
+        )
+
+        sheet_rels = "".join(
+            f'<Relationship Id="rId{n}" Type="{_DOC_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+            for n in sheet_numbers
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            f'{_XML_HEADER}<Relationships xmlns="{_REL_NS}">{sheet_rels}</Relationships>',
+        )
+
+        self._zip.close()